@@ -20,29 +20,67 @@
 # SOFTWARE.
 
 import logging
-from typing import Optional
+from typing import List, Optional, TYPE_CHECKING
 from ehlit.options import OptionsStruct
-from ehlit.parser.ast import AST
+
+if TYPE_CHECKING:
+    from ehlit.parser import ParseError
+    from ehlit.parser.ast import AST
+
+
+def init_logging() -> None:
+    """! Give the log levels the names they are reported with """
+    logging.addLevelName(logging.ERROR, '\033[1;31mError\033[m: ')
+    logging.addLevelName(logging.WARNING, '\033[1;35mWarning\033[m: ')
+    logging.addLevelName(logging.INFO, '\033[1;37mNote\033[m: ')
+    logging.addLevelName(logging.DEBUG, '> ')
 
 
 def build(args: OptionsStruct) -> None:
     # Avoid importing submodules in global scope, otherwise they may use the logger before it is
     # initialized
-    from ehlit.parser import parse, ParseError
-    from ehlit.writer import WriteSource, WriteDump, WriteImport
+    from ehlit.parser.ast import AST
+    from ehlit.parser import (
+        ast_cache, c_header, comments, function, parse, parser_cache, ParseError
+    )
+    from ehlit.writer import emitter, WriteSource, WriteDump, WriteHeader, WriteImport
     from ehlit.options import check_arguments
 
     check_arguments(args)
+    parser_cache.enabled = args.parser_cache
+    comments.enabled = args.blank_comments
+    parser_cache.bounded_memo = args.bounded_memo
+    ast_cache.directory = args.ast_cache
+    c_header.cache_file = args.toolchain_cache
+    c_header.cache_directory = args.header_cache
+    c_header.merge_includes = args.merge_includes
+    # The dump of verbose builds needs the whole AST, which is not kept while streaming
+    streaming: bool = args.low_memory and not args.verbose
+    function.jobs = args.jobs
+    # Function bodies are left unparsed until their function is built, either to parse them in a
+    # pool of processes, or to only have the bodies of one function in memory at a time
+    deferred_bodies: bool = args.jobs > 1 or streaming
+    emitter.written = emitter.untouched = 0
     logging.debug('building %s to %s\n', args.source, args.output_file)
 
     failure: Optional[ParseError] = None
     ast: Optional[AST] = None
     try:
-        ast = parse(args.source)
-        ast.build_ast(args)
+        ast = parse(args.source, deferred_bodies)
+        if ast.source_file is not None:
+            logging.debug('peak memo size: %d entries', ast.source_file.peak_memo_size)
+        if streaming:
+            stream(ast, args)
+        else:
+            ast.build_ast(args)
     except ParseError as err:
         failure = err
 
+    if streaming:
+        if failure is not None:
+            raise failure
+        return
+
     if ast is not None and args.verbose:
         WriteDump(ast)
 
@@ -50,8 +88,114 @@ def build(args: OptionsStruct) -> None:
         raise failure
 
     assert ast is not None
-    WriteSource(ast, args.output_file)
+    WriteSource(ast, args.output_file, headers=args.output_header_file is not None)
+    if args.output_header_file is not None:
+        WriteHeader(ast, args.output_header_file, args.source)
     WriteImport(ast, args.output_import_file)
+    finish_outputs(args)
+
+    if failure is not None:
+        raise failure
+
+
+def stream(ast: 'AST', args: OptionsStruct) -> None:
+    """!
+    Build a parsed source, writing each top-level node as soon as it is built.
+
+    The body of each function is freed once written, so that big sources never have all of them
+    in memory at once. The outputs are only written once all the nodes are built, and not at all if
+    any of them failed with an error.
+    @param ast @b AST The parsed source
+    @param args @b OptionsStruct Options of the build
+    @throw ParseError If any node failed to build, once the others are built
+    """
+    from ehlit.parser import ParseError
+    from ehlit.writer import SourceWriter, WriteSource, WriteHeader, WriteImport
+
+    headers: bool = args.output_header_file is not None
+    outputs: List[SourceWriter] = [WriteSource(None, args.output_file, headers=headers)]
+    imports: WriteImport = WriteImport(None, args.output_import_file)
+    if args.output_header_file is not None:
+        outputs.append(WriteHeader(None, args.output_header_file, args.source))
+    failure: Optional[ParseError] = None
+    failed: bool = False
+    try:
+        for node in ast.build_nodes(args):
+            # Nodes which failed may not be written, and the outputs will be dropped anyway
+            failed = failed or any(f.severity > ParseError.Severity.Warning
+                                   for f in ast.failures)
+            if failed:
+                continue
+            for out in outputs:
+                out.write_top_level(node)
+            imports.write_top_level(node)
+            for fun in ast.functions_of([node]):
+                fun.drop_body()
+    except ParseError as err:
+        failure = err
 
+    if failure is not None and failure.max_level > ParseError.Severity.Warning:
+        for out in outputs:
+            out.discard()
+        imports.discard()
+        raise failure
+    for out in outputs:
+        out.close()
+    imports.close()
+    finish_outputs(args)
     if failure is not None:
         raise failure
+
+
+def finish_outputs(args: OptionsStruct) -> None:
+    """! Cache the interface of the import file once the outputs are written
+    @param args @b OptionsStruct Options of the build
+    """
+    from ehlit.parser import interface
+    from ehlit.writer import emitter
+    if args.output_import_file != '-':
+        interface.write(args.output_import_file)
+    logging.debug('%d outputs written, %d left untouched', emitter.written, emitter.untouched)
+
+
+def report(err: 'ParseError') -> None:
+    """! Log the failures of a build
+    @param err @b ParseError The failures
+    """
+    from ehlit.parser import ParseError
+    for f in err.failures:
+        if f.severity < ParseError.Severity.Error:
+            logging.warning(str(f))
+        else:
+            logging.error(str(f))
+    logging.info(err.summary)
+
+
+def run(args: OptionsStruct) -> bool:
+    """! Build what has been asked on the command line, and log the failures
+    @param args @b OptionsStruct The parsed arguments
+    @return @b bool True if everything has been built, possibly with warnings
+    """
+    from ehlit import options
+    from ehlit.parser import ParseError
+    try:
+        if options.is_project(args):
+            from ehlit.project import build_project, ProjectResult
+            options.check_project_arguments(args)
+            result: ProjectResult = build_project(args)
+            for err in result.failures.values():
+                report(err)
+            for src in result.skipped:
+                logging.error('%s: not built, as some sources it imports failed to build' % src)
+            return result.succeeded
+        build(args)
+
+    except ParseError as err:
+        report(err)
+        return err.max_level <= ParseError.Severity.Warning
+
+    except options.ArgError as err:
+        logging.error(str(err))
+        return False
+
+    return True
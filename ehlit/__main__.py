@@ -20,35 +20,16 @@
 # SOFTWARE.
 
 import logging
-from ehlit import options
+from ehlit import init_logging, options
 
 opts: options.OptionsStruct = options.parse_arguments()
 
-logging.addLevelName(logging.ERROR, '\033[1;31mError\033[m: ')
-logging.addLevelName(logging.WARNING, '\033[1;35mWarning\033[m: ')
-logging.addLevelName(logging.INFO, '\033[1;37mNote\033[m: ')
-logging.addLevelName(logging.DEBUG, '> ')
+init_logging()
 logging.basicConfig(format='%(levelname)s%(message)s',
                     level=logging.DEBUG if opts.verbose else logging.INFO)
 
 # Do not import submodules before the logger is initialized, as they may use it
-from ehlit.parser import ParseError
-from ehlit import build
+from ehlit import run
 
-try:
-    build(opts)
-
-except ParseError as err:
-    for f in err.failures:
-        if f.severity < ParseError.Severity.Error:
-            logging.warning(str(f))
-        else:
-            logging.error(str(f))
-
-    logging.info(err.summary)
-    if err.max_level > ParseError.Severity.Warning:
-        exit(-1)
-
-except options.ArgError as err:
-    logging.error(str(err))
+if not run(opts):
     exit(-1)
@@ -0,0 +1,102 @@
+# Copyright © 2019 Cedric Legrand
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice (including the next
+# paragraph) shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""!
+Thin client of the compile server.
+
+It takes the same arguments as the compiler, and has them built by a compile server started with
+`python -m ehlit.server`, whose parsers and C toolchain are already set up. Only the standard
+library is used here, so that starting it costs next to nothing.
+"""
+
+import errno
+import getpass
+import json
+import os
+import socket
+import sys
+from os import environ, getcwd, path
+from tempfile import gettempdir
+from typing import Any, Dict, List, Optional
+
+## @b bool Whether the platform has Unix sockets, which the compile server listens on.
+unix_sockets: bool = hasattr(socket, 'AF_UNIX')
+
+
+def default_socket() -> str:
+    """! Get the socket of the compile server, which may be set with EHLIT_SOCKET
+    @return @b str The path of the socket
+    """
+    user: str = str(os.getuid()) if hasattr(os, 'getuid') else getpass.getuser()
+    return environ.get('EHLIT_SOCKET') or path.join(gettempdir(), 'ehlit-{}.sock'.format(user))
+
+
+def check_platform() -> None:
+    """! Make sure the compile server can be used on this platform
+    @throw OSError If the platform has no Unix sockets
+    """
+    if not unix_sockets:
+        raise OSError(errno.EAFNOSUPPORT,
+                      'the compile server needs Unix sockets, which this platform does not have')
+
+
+def build(argv: List[str], socket_path: Optional[str] = None) -> Dict[str, Any]:
+    """! Have the compile server build from the current directory
+    @param argv @b List[str] Arguments of the compiler
+    @param socket_path @b Optional[str] Socket of the compile server, the default one if None
+    @return @b Dict[str, Any] The exit status of the build in status, and what it printed in
+        stdout and stderr
+    """
+    check_platform()
+    request: bytes = json.dumps({'cwd': getcwd(), 'argv': argv}).encode() + b'\n'
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path or default_socket())
+        sock.sendall(request)
+        sock.shutdown(socket.SHUT_WR)
+        reply: List[bytes] = []
+        while True:
+            data: bytes = sock.recv(65536)
+            if len(data) == 0:
+                break
+            reply.append(data)
+    res: Dict[str, Any] = json.loads(b''.join(reply).decode())
+    return res
+
+
+def main() -> int:
+    if not unix_sockets:
+        sys.stderr.write('the compile server needs Unix sockets, which this platform does not '
+                         'have, use python -m ehlit instead\n')
+        return 255
+    socket_path: str = default_socket()
+    try:
+        reply: Dict[str, Any] = build(sys.argv[1:], socket_path)
+    except OSError as err:
+        sys.stderr.write('no compile server on {}: {}\n'.format(socket_path, err.strerror))
+        return 255
+    sys.stdout.write(reply['stdout'])
+    sys.stderr.write(reply['stderr'])
+    status: int = reply['status']
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -21,13 +21,26 @@
 
 from argparse import ArgumentParser
 from os import path, makedirs
-from typing import cast
+from typing import List, Optional, Tuple, cast
 
 
 class OptionsStruct:
+    ast_cache: Optional[str]
+    blank_comments: bool
+    bounded_memo: bool
+    build_state: Optional[str]
+    header_cache: Optional[str]
+    headers: bool
+    jobs: int
     output_import_file: str
+    low_memory: bool
+    merge_includes: bool
     output_file: str
+    output_header_file: Optional[str]
+    parser_cache: bool
     source: str
+    sources: List[str]
+    toolchain_cache: Optional[str]
     verbose: bool
 
 
@@ -36,28 +49,83 @@ class ArgError(Exception):
         self.msg: str = msg
 
 
+def default_outputs(source: str) -> Tuple[str, str]:
+    """! Get where the outputs of a source go when not specified
+    @param source @b str Path of the source
+    @return @b Tuple[str, str] The paths of the C file and of the import file
+    """
+    src: str = path.splitext(source)[0]
+    return 'out/src/' + src + ".c", 'out/include/' + src + ".eh"
+
+
+def default_header(module: str) -> str:
+    """! Get where the C header of a module goes when not specified
+    It is put next to the import file of the module.
+    @param module @b str Path of the import file of the module, or of its source
+    @return @b str The path of the C header
+    """
+    import_file: str = path.relpath(module)
+    if not import_file.startswith(path.join('out', 'include', '')):
+        import_file = default_outputs(import_file)[1]
+    return path.splitext(import_file)[0] + ".h"
+
+
 def check_arguments(args: OptionsStruct) -> None:
-    src, ext = path.splitext(args.source)
+    ext: str = path.splitext(args.source)[1]
     if ext != ".eh":
         raise ArgError("%s: not an ehlit source file" % args.source)
     elif not path.isfile(args.source):
         raise ArgError("%s: no such file or directory" % args.source)
 
+    output_file, output_import_file = default_outputs(args.source)
     if args.output_file is None:
-        args.output_file = 'out/src/' + src + ".c"
+        args.output_file = output_file
     if args.output_file != '-':
         makedirs(path.dirname(args.output_file), exist_ok=True)
 
     if args.output_import_file is None:
-        args.output_import_file = 'out/include/' + src + ".eh"
+        args.output_import_file = output_import_file
     if args.output_import_file != '-':
         makedirs(path.dirname(args.output_import_file), exist_ok=True)
 
+    if args.headers and args.output_header_file is None:
+        args.output_header_file = default_header(args.source if args.output_import_file == '-'
+                                                 else args.output_import_file)
+    if args.output_header_file is not None and args.output_header_file != '-':
+        makedirs(path.dirname(args.output_header_file), exist_ok=True)
+
+    if args.ast_cache is not None:
+        makedirs(args.ast_cache, exist_ok=True)
+
+    if args.jobs < 1:
+        raise ArgError("%d: invalid number of jobs" % args.jobs)
+
+
+def is_project(args: OptionsStruct) -> bool:
+    """! Check whether the arguments ask to build several sources at once
+    @param args @b OptionsStruct The parsed arguments
+    @return @b bool True if several sources or a directory have been given
+    """
+    return len(args.sources) > 1 or path.isdir(args.sources[0])
+
+
+def check_project_arguments(args: OptionsStruct) -> None:
+    if (args.output_file is not None or args.output_import_file is not None or
+            args.output_header_file is not None):
+        raise ArgError("output files may not be specified when building several sources")
+    if args.jobs < 1:
+        raise ArgError("%d: invalid number of jobs" % args.jobs)
+    for src in args.sources:
+        if not path.exists(src):
+            raise ArgError("%s: no such file or directory" % src)
+
 
-def parse_arguments() -> OptionsStruct:
+def parse_arguments(argv: Optional[List[str]] = None) -> OptionsStruct:
     parser: ArgumentParser = ArgumentParser(description="Compile Ehlit source files")
 
-    parser.add_argument('source', help="Source files to build")
+    parser.add_argument('sources', nargs='+', metavar='source',
+                        help="Source files to build. Directories are searched for sources, which "
+                        "are built in the order of their imports")
 
     # Generation options
     gen_args = parser.add_argument_group('Generation arguments')
@@ -65,11 +133,62 @@ def parse_arguments() -> OptionsStruct:
                           help="File where to write the output. You may use '-' for stdout")
     gen_args.add_argument("--gen-import-output", dest="output_import_file",
                           help="File where to write the import file. You may use '-' for stdout")
+    gen_args.add_argument("--gen-header-output", dest="output_header_file",
+                          help="File where to write the C header, implies --gen-headers. You may "
+                          "use '-' for stdout")
+    gen_args.add_argument("--gen-headers", dest="headers", action="store_true", default=False,
+                          help="Write a C header declaring the symbols of each source, next to its "
+                          "import file, and include the headers of the imported sources instead "
+                          "of declaring their symbols again in each C file")
 
     gen_args.add_argument("-v", "--gen-verbose", dest="verbose", action="store_true",
                           help="Print debug messages")
     gen_args.add_argument("-q", "--gen-quiet", dest="verbose", action="store_false", default=False,
                           help="Do not print debug messages [default]")
+    gen_args.add_argument("--gen-no-parser-cache", dest="parser_cache", action="store_false",
+                          default=True,
+                          help="Build a new parser for each parsed file, for grammar debugging")
+    gen_args.add_argument("--gen-no-comment-blanking", dest="blank_comments",
+                          action="store_false", default=True,
+                          help="Let the grammar skip comments by itself instead of blanking them "
+                          "out first, for grammar debugging")
+    gen_args.add_argument("--gen-ast-cache", dest="ast_cache", default='out/cache/ast',
+                          help="Directory where parsed sources are cached [default: out/cache/ast]")
+    gen_args.add_argument("--gen-no-ast-cache", dest="ast_cache", action="store_const",
+                          const=None, help="Parse all sources, even those that did not change")
+    gen_args.add_argument("--gen-header-cache", dest="header_cache", default='out/cache/headers',
+                          help="Directory where translated C headers are cached [default: "
+                          "out/cache/headers]")
+    gen_args.add_argument("--gen-no-header-cache", dest="header_cache", action="store_const",
+                          const=None, help="Parse all C headers, even those that did not change")
+    gen_args.add_argument("--gen-no-merged-includes", dest="merge_includes",
+                          action="store_false", default=True,
+                          help="Parse each included C header on its own, instead of all the "
+                          "headers of a source at once")
+    gen_args.add_argument("--gen-toolchain-cache", dest="toolchain_cache",
+                          default='out/cache/toolchain.json',
+                          help="File where the C toolchain found on the first C include is kept "
+                          "[default: out/cache/toolchain.json]")
+    gen_args.add_argument("--gen-no-toolchain-cache", dest="toolchain_cache", action="store_const",
+                          const=None, help="Look for the C toolchain on each build")
+    gen_args.add_argument("--gen-bounded-memo", dest="bounded_memo", action="store_true",
+                          default=False,
+                          help="Only memoize the rules backtracking the most while parsing, and "
+                          "forget about them after each top-level statement. Lowers memory usage "
+                          "on big sources")
+    gen_args.add_argument("--gen-low-memory", dest="low_memory", action="store_true",
+                          default=False,
+                          help="Write each declaration as soon as it is built, and free its body. "
+                          "Lowers memory usage on big sources")
+    gen_args.add_argument("--gen-build-state", dest="build_state", default='out/build_state.json',
+                          help="File where the results of the build of several sources are kept, "
+                          "to only rebuild what changed the next time [default: "
+                          "out/build_state.json]")
+    gen_args.add_argument("--gen-no-build-state", dest="build_state", action="store_const",
+                          const=None, help="Rebuild all sources when building several sources")
+    gen_args.add_argument("-j", "--gen-jobs", dest="jobs", type=int, default=1,
+                          help="Number of processes building sources, or parsing function bodies "
+                          "when building a single source [default: 1]")
 
     # Warning options
     warn_args = parser.add_argument_group('Warning behavior arguments')
@@ -78,4 +197,6 @@ def parse_arguments() -> OptionsStruct:
     warn_args.add_argument("--warn-no-error", dest="warn_error", action="store_false",
                            help="Do not treat any warning as error [default]")
 
-    return cast(OptionsStruct, parser.parse_args())
+    args: OptionsStruct = cast(OptionsStruct, parser.parse_args(argv))
+    args.source = args.sources[0]
+    return args
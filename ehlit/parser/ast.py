@@ -20,18 +20,23 @@
 # SOFTWARE.
 
 from abc import abstractmethod
-from arpeggio import ParserPython
 from enum import IntEnum, IntFlag
 from os import path, getcwd, listdir
-from typing import Iterator, List, Optional, TypeVar, Union, cast
+from typing import Dict, Iterator, List, Optional, Set, Tuple, TypeVar, Union, cast
 import typing
-from ehlit.parser.error import ParseError, Failure
+from ehlit.parser.error import ParseError, Failure, SourceFile
 from ehlit.options import OptionsStruct
 
 T = TypeVar('T', bound='Node')
 
 imported: List[str] = []
 included: List[str] = []
+## @b Set[str] Files the AST being built depends on, besides its source: the files it imports,
+## and the C headers it includes along with the files they include.
+dependencies: Set[str] = set()
+## @b Dict[str, BuiltinType] The builtin types declared by the AST being built, by name. They are
+## shared by every node referring to them, see BuiltinType.get.
+builtin_types: Dict[str, 'BuiltinType'] = {}
 
 
 class DeclarationLookup(list):
@@ -105,6 +110,67 @@ class DeclarationLookup(list):
             self.merge(decl.get_declaration(self._name))
 
 
+class DeclarationIndex:
+    """!
+    Index of the declarations exposed by a list of nodes, by name.
+
+    Looking for a symbol in a list of nodes means asking each of them, which is linear in the size
+    of the list. This remembers which nodes may expose which names, so that only these ones are
+    asked. Nodes whose names cannot be known in advance (see Node.exposed_names) are always asked.
+    Either way, nodes are asked in the order of the list, so the result is the same as
+    DeclarationLookup.find_in.
+    """
+
+    def __init__(self, nodes: Optional[List['Node']] = None) -> None:
+        """! Constructor
+        @param nodes @b List[Node] The indexed list, which may be None for an empty scope
+        """
+        ## @b List[Node] The indexed list.
+        self.nodes: Optional[List[Node]] = nodes
+        self._size: int = 0
+        self._by_name: Dict[str, List[Tuple[int, Node]]] = {}
+        self._always: List[Tuple[int, Node]] = []
+        if nodes is not None:
+            for node in nodes:
+                self.add(node)
+
+    def add(self, node: 'Node') -> None:
+        """! Index a node that have just been appended to the indexed list
+        @param node @b Node The appended node
+        """
+        entry: Tuple[int, Node] = (self._size, node)
+        self._size += 1
+        names: Optional[List[str]] = node.exposed_names
+        if names is None:
+            self._always.append(entry)
+            return
+        for name in names:
+            try:
+                self._by_name[name].append(entry)
+            except KeyError:
+                self._by_name[name] = [entry]
+
+    def indexes(self, nodes: Optional[List['Node']]) -> bool:
+        """! Check whether this index is up to date with a list
+        @param nodes @b List[Node] The list to check
+        @return @b bool True if this index is the index of nodes
+        """
+        return nodes is self.nodes and (nodes is None or len(nodes) == self._size)
+
+    def find(self, sym: str) -> DeclarationLookup:
+        """! Find matching declarations in the indexed list
+        @param sym @b str The symbol to look for
+        @return @b DeclarationLookup The declarations matching sym
+        """
+        res: DeclarationLookup = DeclarationLookup(sym)
+        found: List[Tuple[int, Node]] = self._by_name.get(sym, [])
+        if len(self._always) != 0:
+            found = sorted(found + self._always, key=lambda entry: entry[0])
+        for _, node in found:
+            res.merge(node.get_declaration(sym))
+        return res
+
+
 class Qualifier(IntFlag):
     """!
     Qualifier for a declaration
@@ -217,8 +283,13 @@ class UnparsedContents:
 class Node:
     """!
     Base class for all AST node types. It defines some default behaviors.
+
+    Nodes are made by the million on big sources, so their attributes are stored in slots. Scopes
+    are comparatively rare and mixed into other node types, so they keep a dictionary instead.
     """
 
+    __slots__ = ('pos', 'built', '_parent')
+
     def __init__(self, pos: int = 0) -> None:
         """! Constructor
         @param pos @b int The position of the node in the source file
@@ -256,6 +327,14 @@ class Node:
         """
         return DeclarationLookup(sym)
 
+    @property
+    def exposed_names(self) -> Optional[List[str]]:
+        """! @c property @b List[str] Names that get_declaration may find in this node.
+        This is what scopes index their contents with. It must not change once the node is in a
+        scope, so nodes that cannot tell in advance return None, and always get asked instead.
+        """
+        return []
+
     def fail(self, severity: ParseError.Severity, pos: int, msg: str) -> None:
         """! Report a failure to the parent, up to the AST where it will be handled.
         There is no reason to override it, except maybe intercepting it for whatever reason.
@@ -348,6 +427,14 @@ class Node:
         if self._parent is None:
             self._parent = parent
 
+    def reparent(self, parent: 'Node') -> None:
+        """! Move the node to another parent
+        Unlike setting parent, which only gives a parent to a node without one, it replaces the
+        current parent of the node, if any.
+        @param parent @b Node The new parent of the node
+        """
+        self._parent = parent
+
 
 class Scope(Node):
     """! Container for declarations.
@@ -360,13 +447,24 @@ class Scope(Node):
         super().__init__(pos)
         self.declarations: List[DeclarationBase] = []
         self.predeclarations: List[DeclarationBase] = []
+        self._declarations_index: DeclarationIndex = DeclarationIndex()
 
     def declare(self, decl: 'DeclarationBase') -> None:
+        index: DeclarationIndex = self.declarations_index
         self.declarations.append(decl)
+        index.add(decl)
 
-    def find_declaration(self, sym: str) -> DeclarationLookup:
+    @property
+    def declarations_index(self) -> DeclarationIndex:
+        """! @c property @b DeclarationIndex Index of the symbols declared in this scope """
         # MyPy does not consider List[DeclarationBase] as a List[Node]
-        res: DeclarationLookup = DeclarationLookup(sym, cast(List[Node], self.declarations))
+        declarations: List[Node] = cast(List[Node], self.declarations)
+        if not self._declarations_index.indexes(declarations):
+            self._declarations_index = DeclarationIndex(declarations)
+        return self._declarations_index
+
+    def find_declaration(self, sym: str) -> DeclarationLookup:
+        res: DeclarationLookup = self.declarations_index.find(sym)
         res.merge(super().find_declaration(sym))
         for decl in res:
             if decl is not None and not decl.built:
@@ -377,11 +475,21 @@ class Scope(Node):
 class UnorderedScope(Scope):
     """! @c Scope in which declaration order does not matter """
 
+    _contents_index: Optional[DeclarationIndex] = None
+
     def find_declaration(self, sym: str) -> DeclarationLookup:
-        res: DeclarationLookup = DeclarationLookup(sym, self.scope_contents)
+        res: DeclarationLookup = self.contents_index.find(sym)
         res.merge(super().find_declaration(sym))
         return res
 
+    @property
+    def contents_index(self) -> DeclarationIndex:
+        """! @c property @b DeclarationIndex Index of the contents of the scope """
+        contents: List[Node] = self.scope_contents
+        if self._contents_index is None or not self._contents_index.indexes(contents):
+            self._contents_index = DeclarationIndex(contents)
+        return self._contents_index
+
     @property
     @abstractmethod
     def scope_contents(self) -> List[Node]:
@@ -391,6 +499,105 @@ class UnorderedScope(Scope):
         raise NotImplementedError
 
 
+class StatementLink:
+    """! Link of a @c StatementList """
+
+    __slots__ = ('stmt', 'prev', 'next', 'passed')
+
+    def __init__(self, stmt: 'Statement') -> None:
+        """! Constructor
+        @param stmt @b Statement The statement held by this link
+        """
+        ## @b Statement The statement held by this link.
+        self.stmt: Statement = stmt
+        ## @b Optional[StatementLink] The previous link, None for the first one.
+        self.prev: Optional[StatementLink] = None
+        ## @b Optional[StatementLink] The next link, None for the last one.
+        self.next: Optional[StatementLink] = None
+        ## @b bool Whether the statement comes before the one being built.
+        self.passed: bool = False
+
+
+class StatementList:
+    """!
+    Doubly linked list of statements.
+
+    @c FlowScope inserts statements around the one being built, for each temporary it needs. With
+    a plain list, each insertion searches and shifts the body, which goes quadratic on big bodies.
+    Here, insertions around a statement of the list are done in constant time.
+    """
+
+    def __init__(self, statements: List['Statement']) -> None:
+        """! Constructor
+        @param statements @b List[Statement] The initial statements, in order
+        """
+        ## @b Optional[StatementLink] The first link of the list.
+        self.first: Optional[StatementLink] = None
+        self._last: Optional[StatementLink] = None
+        self._links: Dict[int, StatementLink] = {}
+        for stmt in statements:
+            self.insert_after(stmt, self._last)
+
+    def __iter__(self) -> Iterator['Statement']:
+        link: Optional[StatementLink] = self.first
+        while link is not None:
+            yield link.stmt
+            link = link.next
+
+    def link(self, stmt: Node) -> StatementLink:
+        """! Get the link holding a statement
+        @param stmt @b Node A statement of this list
+        @return @b StatementLink The link holding the statement
+        """
+        return self._links[id(stmt)]
+
+    def set(self, link: StatementLink, stmt: 'Statement') -> None:
+        """! Replace the statement held by a link
+        @param link @b StatementLink A link of this list
+        @param stmt @b Statement The new statement
+        """
+        link.stmt = stmt
+        self._links[id(stmt)] = link
+
+    def insert_before(self, stmt: 'Statement', before: StatementLink) -> StatementLink:
+        """! Insert a statement before a link
+        @param stmt @b Statement The statement to insert
+        @param before @b StatementLink The link before which the statement is inserted
+        @return @b StatementLink The link holding the inserted statement
+        """
+        link: StatementLink = StatementLink(stmt)
+        link.prev = before.prev
+        link.next = before
+        if before.prev is None:
+            self.first = link
+        else:
+            before.prev.next = link
+        before.prev = link
+        self._links[id(stmt)] = link
+        return link
+
+    def insert_after(self, stmt: 'Statement', after: Optional[StatementLink]) -> StatementLink:
+        """! Insert a statement after a link
+        @param stmt @b Statement The statement to insert
+        @param after @b Optional[StatementLink] The link after which the statement is inserted, None
+            to insert it first
+        @return @b StatementLink The link holding the inserted statement
+        """
+        link: StatementLink = StatementLink(stmt)
+        link.prev = after
+        link.next = self.first if after is None else after.next
+        if link.next is None:
+            self._last = link
+        else:
+            link.next.prev = link
+        if after is None:
+            self.first = link
+        else:
+            after.next = link
+        self._links[id(stmt)] = link
+        return link
+
+
 class FlowScope(Scope):
     """! Scope containing a @c Statement flow
     It adds the ability to change the statement flow at build time.
@@ -400,16 +607,23 @@ class FlowScope(Scope):
         super().__init__(pos)
         self._body: List[Statement] = body
         self._post_body: List[Statement] = []
+        self._flow: Optional[StatementList] = None
         for node in self._body:
             node.parent = self
 
     def build(self) -> Node:
         super().build()
-        self._counter: int = 0
-        while self._counter < len(self._body):
-            res = self.make(self._body[self._counter])
-            self._body[self._counter] = res
-            self._counter += 1
+        flow: StatementList = StatementList(self._body)
+        self._flow = flow
+        link: Optional[StatementLink] = flow.first
+        while link is not None:
+            # Statements inserted ahead of the one being built have already been built
+            if not link.passed:
+                flow.set(link, self.make(link.stmt))
+                link.passed = True
+            link = link.next
+        self._body = list(flow)
+        self._flow = None
         return self
 
     def do_before(self, do: Node, before: Node) -> None:
@@ -421,13 +635,11 @@ class FlowScope(Scope):
         if not isinstance(do, Statement):
             super().do_before(do, before)
             return
-        assert isinstance(before, Statement)
-        idx: int = self._body.index(before)
-        self._body.insert(idx, do)
-        self._counter += 1
-        if not self._body[idx].built:
-            res = self.make(self._body[idx])
-            self._body[idx] = res
+        assert isinstance(before, Statement) and self._flow is not None
+        link: StatementLink = self._flow.insert_before(do, self._flow.link(before))
+        link.passed = True
+        if not do.built:
+            self._flow.set(link, self.make(do))
 
     def do_after(self, do: Node, after: Node) -> None:
         """! Insert a @c Statement to be executed after @c after
@@ -438,13 +650,12 @@ class FlowScope(Scope):
         if not isinstance(do, Statement):
             super().do_after(do, after)
             return
-        assert isinstance(after, Statement)
-        idx: int = self._body.index(after) + 1
-        if idx <= self._counter:
-            self._body.insert(idx, self.make(do))
-            self._counter += 1
+        assert isinstance(after, Statement) and self._flow is not None
+        after_link: StatementLink = self._flow.link(after)
+        if after_link.passed:
+            self._flow.insert_after(self.make(do), after_link).passed = True
         else:
-            self._body.insert(idx, do)
+            self._flow.insert_after(do, after_link)
 
     def do_at_end(self, do: Node) -> None:
         """! Execute a @c Statement at the end of this FlowScope
@@ -481,6 +692,7 @@ class GenericExternInclusion(UnorderedScope):
         self.lib: str = '/'.join(lib)
         ## @b List[Node] The symbols that have been imported from the library
         self.syms: List[Node] = []
+        self._symbols: Optional[Dict[str, List[Node]]] = None
 
     def build(self) -> 'GenericExternInclusion':
         """! Build the node, this actually imports the file"""
@@ -492,9 +704,38 @@ class GenericExternInclusion(UnorderedScope):
             for e in err.failures:
                 self.fail(e.severity, self.pos, e.msg)
         for s in parsed:
-            self.syms.append(self.make(s))
+            sym: Node = self.make(s)
+            index: DeclarationIndex = self.contents_index
+            self.syms.append(sym)
+            index.add(sym)
+        self._symbols = self._make_symbols()
         return self
 
+    def _make_symbols(self) -> Dict[str, List[Node]]:
+        """! Map the names of the imported symbols to their declarations.
+        Symbols imported by nested inclusions are mapped too, so that any lookup is a single
+        access, whatever the depth of inclusions.
+        @return @b Dict[str, List[Node]] The declarations of each name, in import order
+        """
+        res: Dict[str, List[Node]] = {}
+        for sym in self.syms:
+            if isinstance(sym, GenericExternInclusion):
+                for name, decls in sym.symbols.items():
+                    res.setdefault(name, []).extend(decls)
+                continue
+            for name in sym.exposed_names or []:
+                found: DeclarationLookup = sym.get_declaration(name)
+                if len(found) != 0:
+                    res.setdefault(name, []).extend(found)
+        return res
+
+    @property
+    def symbols(self) -> Dict[str, List[Node]]:
+        """! @c property @b Dict[str, List[Node]] Declarations of the imported symbols, by name """
+        if self._symbols is None:
+            return self._make_symbols()
+        return self._symbols
+
     @abstractmethod
     def parse(self) -> List[Node]:
         """! Parse the imported file
@@ -507,16 +748,35 @@ class GenericExternInclusion(UnorderedScope):
         @param sym @b List[str] The symbol to look for
         @return @b Declaration The declaration if found, @c None otherwise
         """
-        return DeclarationLookup(sym, self.syms)
+        if self._symbols is None:
+            # Still importing
+            return self.contents_index.find(sym)
+        res: DeclarationLookup = DeclarationLookup(sym)
+        res.extend(self._symbols.get(sym, []))
+        return res
 
     @property
     def scope_contents(self) -> List[Node]:
         return self.syms
 
+    @property
+    def exposed_names(self) -> Optional[List[str]]:
+        # Symbols are only known once built
+        return None
+
 
 class Import(GenericExternInclusion):
     """! Specialization of GenericExternInclusion for Ehlit imports. """
 
+    def __init__(self, pos: int, lib: List[str]) -> None:
+        """! Constructor
+        @param pos @b int The position of the node in the source file
+        @param lib @b List[str] Path of the file to be imported
+        """
+        super().__init__(pos, lib)
+        ## @b List[str] The files parsed by this import. Those imported before are not listed.
+        self.files: List[str] = []
+
     def import_dir(self, dir: str) -> List[Node]:
         """! Import a whole directory.
         This recursively imports all Ehlit files in the specified directory.
@@ -531,10 +791,23 @@ class Import(GenericExternInclusion):
             imported.append(full_path)
             if path.isdir(full_path):
                 res += self.import_dir(full_path)
-            elif path.isfile(full_path):
-                res += source.parse(full_path).nodes
+            elif path.isfile(full_path) and full_path.endswith('.eh'):
+                res += self.parse_file(full_path)
         return res
 
+    def parse_file(self, full_path: str) -> List[Node]:
+        """! Parse an imported file, or load its interface from the AST cache if it has one.
+        @param full_path @b str The path of the file to import.
+        @return @b List[Node] A list of the imported nodes.
+        """
+        self.files.append(full_path)
+        dependencies.add(full_path)
+        ast: AST = source.parse(full_path)
+        # The nodes belong to this import now, not to the unbuilt AST they have been parsed in
+        for node in ast.nodes:
+            node.reparent(self)
+        return ast.nodes
+
     def parse(self) -> List[Node]:
         """! Parse the imported file or directory contents.
         @return @b List[Node] A list of the imported nodes.
@@ -551,7 +824,7 @@ class Import(GenericExternInclusion):
                 if full_path in imported:
                     return []
                 imported.append(full_path)
-                return source.parse(full_path).nodes
+                return self.parse_file(full_path)
         self.error(self.pos, '%s: no such file or directory' % self.lib)
         return []
 
@@ -579,13 +852,15 @@ class Include(GenericExternInclusion):
         return c_header.parse(self.lib)
 
     def declare(self, decl: 'DeclarationBase') -> None:
-        decl.declaration_type = DeclarationType.C
-        self.declarations.append(decl)
+        decl.declaration_type = DeclarationType.C  # type: ignore[misc]
+        super().declare(decl)
 
 
 class Value(Node):
     """! Base for all nodes representing a value. """
 
+    __slots__ = ('_ref_offset', '_cast')
+
     def __init__(self, pos: int = 0) -> None:
         """! Constructor
         @param pos @b int The position of the node in the source file
@@ -669,17 +944,17 @@ class Value(Node):
         """
         src: 'Type' = self.typ
         target_ref_level: int = 0
-        self_typ: 'Type' = self.typ
+        self_typ: 'Type' = src
         if isinstance(self_typ, ReferenceType):
             self_typ = self_typ.inner_child
         target_typ: 'Type' = target if isinstance(target, Type) else target.typ
         if isinstance(target_typ, ReferenceType):
             target_typ = target_typ.inner_child
         if self_typ != target_typ:
-            if self_typ == BuiltinType('@any'):
+            if self_typ == BuiltinType.get(self, '@any'):
                 self.cast = self._from_any_aligned(target, self.typ, True)
                 src = self.cast.typ
-            elif target_typ == BuiltinType('@any'):
+            elif target_typ == BuiltinType.get(self, '@any'):
                 target = self._from_any_aligned(self, target, False)
                 parent = self.parent
                 if type(parent) is CompoundIdentifier:
@@ -698,9 +973,13 @@ class Value(Node):
 
 
 class DeclarationBase(Node):
+    # Mixed with Symbol by Alias, so the slot is declared by the concrete classes
+    __slots__ = ()
+    declaration_type: DeclarationType
+
     def __init__(self, pos: int = 0) -> None:
         Node.__init__(self, pos)
-        self.declaration_type: DeclarationType = DeclarationType.EHLIT
+        self.declaration_type = DeclarationType.EHLIT  # type: ignore[misc]
 
     def get_declaration(self, sym: str) -> DeclarationLookup:
         res = DeclarationLookup(sym)
@@ -708,6 +987,10 @@ class DeclarationBase(Node):
             res.append(self)
         return res
 
+    @property
+    def exposed_names(self) -> Optional[List[str]]:
+        return [self.name]
+
     def get_inner_declaration(self, sym: str) -> DeclarationLookup:
         """! Find a declaration strictly in children.
         Container types (like structs) would want to search symbols in this function.
@@ -734,6 +1017,8 @@ class DeclarationBase(Node):
 
 
 class Type(DeclarationBase):
+    __slots__ = ('declaration_type',)
+
     def build(self) -> 'Type':
         super().build()
         return self
@@ -756,6 +1041,8 @@ class Type(DeclarationBase):
 
 
 class Symbol(Value):
+    __slots__ = ('qualifiers', '_canonical')
+
     def __init__(self, pos: int = 0) -> None:
         super().__init__(pos)
         self.qualifiers: Qualifier = Qualifier.NONE
@@ -806,13 +1093,37 @@ class Symbol(Value):
 
 
 class BuiltinType(Type):
+    """!
+    A builtin type.
+
+    Builtin types have no state of their own besides their name, so the ones declared by the AST
+    are shared by all the nodes using them, and compared by identity first. A copy is only made
+    when a type needs its own parent, like the child of an ArrayType.
+    """
+
+    __slots__ = ('_name', '_child')
+
     @staticmethod
     def make_symbol(parent: Node, name: str) -> 'CompoundIdentifier':
         return parent.make(CompoundIdentifier([Identifier(parent.pos, '@' + name)]))
 
+    @staticmethod
+    def get(node: Node, name: str) -> 'BuiltinType':
+        """! Get the shared instance of a builtin type
+        @param node @b Node The node needing the type, which becomes its parent if there is no
+            shared instance yet
+        @param name @b str The name of the type, including its leading '@'
+        @return @b BuiltinType The built type
+        """
+        try:
+            return builtin_types[name]
+        except KeyError:
+            return node.make(BuiltinType(name))
+
     def __init__(self, name: str) -> None:
         super().__init__()
         self._name: str = name
+        self._child: Optional[Type] = None
 
     def build(self) -> 'BuiltinType':
         super().build()
@@ -821,9 +1132,16 @@ class BuiltinType(Type):
     @property
     def child(self) -> Optional[Type]:
         if self.name == '@str':
-            return self.make(BuiltinType('@char'))
+            if self._child is None:
+                self._child = self.make(BuiltinType('@char'))
+            return self._child
         return None
 
+    @property
+    def is_shared(self) -> bool:
+        """! Whether this is the instance shared by all the nodes using this type """
+        return builtin_types.get(self.name) is self
+
     @property
     def as_symbol(self) -> 'CompoundIdentifier':
         return CompoundIdentifier([Identifier(self.pos, self.name)])
@@ -842,6 +1160,8 @@ class BuiltinType(Type):
         return self._name
 
     def __eq__(self, rhs: object) -> bool:
+        if rhs is self:
+            return True
         if isinstance(rhs, Symbol):
             rhs = rhs.decl
         if isinstance(rhs, BuiltinType):
@@ -857,14 +1177,18 @@ class BuiltinType(Type):
 
 
 class Container(Node):
+    # Mixed with Symbol and Type, so the slot is declared by the concrete classes
+    __slots__ = ()
+    child: Node
+
     def __init__(self, child: Node) -> None:
         super().__init__(0)
-        self.child: Node = child
+        self.child = child  # type: ignore[misc]
         self.child.parent = self
 
     def build(self) -> Node:
         super().build()
-        self.child = self.child.build()
+        self.child = self.child.build()  # type: ignore[misc]
         return self
 
     @property
@@ -875,12 +1199,19 @@ class Container(Node):
 
 
 class SymbolContainer(Symbol, Container):
+    __slots__ = ('child',)
+
     def __init__(self, child: Symbol) -> None:
         self.child: Symbol
-        self.inner_child: Symbol
         super().__init__()
         Container.__init__(self, child)
 
+    @property
+    def inner_child(self) -> Symbol:
+        if isinstance(self.child, SymbolContainer):
+            return self.child.inner_child
+        return self.child
+
     def build(self) -> 'SymbolContainer':
         super().build()
         Container.build(self)
@@ -892,6 +1223,8 @@ class SymbolContainer(Symbol, Container):
 
 
 class Array(SymbolContainer):
+    __slots__ = ('length',)
+
     def __init__(self, child: Symbol, length: Optional[Node]) -> None:
         super().__init__(child)
         self.length: Optional[Node] = length
@@ -931,8 +1264,12 @@ class Array(SymbolContainer):
 
 
 class ArrayType(Type, Container):
+    __slots__ = ('child',)
+
     def __init__(self, child: Type) -> None:
         self.child: Type
+        if isinstance(child, BuiltinType) and child.is_shared:
+            child = child.dup()
         Type.__init__(self)
         Container.__init__(self, child)
         child._parent = self
@@ -964,6 +1301,8 @@ class ArrayType(Type, Container):
 
 
 class Reference(SymbolContainer):
+    __slots__ = ()
+
     def __init__(self, child: Symbol) -> None:
         super().__init__(child)
         self.child: Symbol
@@ -998,6 +1337,8 @@ class Reference(SymbolContainer):
 
 
 class ReferenceToValue(Reference):
+    __slots__ = ()
+
     def __init__(self, child: Symbol) -> None:
         super().__init__(child)
 
@@ -1011,7 +1352,7 @@ class ReferenceToValue(Reference):
         if self.child.decl is not None:
             assert isinstance(self.inner_child.decl, Declaration)
             return self.inner_child.decl.typ
-        return self.make(BuiltinType('@any'))
+        return BuiltinType.get(self, '@any')
 
     @property
     def ref_offset(self) -> int:
@@ -1026,6 +1367,8 @@ class ReferenceToValue(Reference):
 
 
 class ReferenceToType(Reference):
+    __slots__ = ()
+
     def __init__(self, child: Symbol, qualifiers: Qualifier = Qualifier.NONE) -> None:
         super().__init__(child)
         self.qualifiers: Qualifier = qualifiers
@@ -1048,8 +1391,12 @@ class ReferenceToType(Reference):
 
 
 class ReferenceType(Type, Container):
+    __slots__ = ('child', 'qualifiers')
+
     def __init__(self, child: Type, qualifiers: Qualifier = Qualifier.NONE) -> None:
         self.child: Type
+        if isinstance(child, BuiltinType) and child.is_shared:
+            child = child.dup()
         Container.__init__(self, child)
         Type.__init__(self)
         self.qualifiers: Qualifier = qualifiers
@@ -1097,6 +1444,8 @@ class ReferenceType(Type, Container):
 
 
 class FunctionType(Type):
+    __slots__ = ('args', 'ret', 'is_variadic', 'variadic_type')
+
     def __init__(self, ret: Symbol, args: List['VariableDeclaration'],
                  is_variadic: bool = False, variadic_type: Optional[Symbol] = None) -> None:
         super().__init__()
@@ -1140,6 +1489,8 @@ class FunctionType(Type):
 
 
 class Operator(Node):
+    __slots__ = ('op',)
+
     def __init__(self, op: str) -> None:
         super().__init__()
         self.op: str = op
@@ -1149,6 +1500,8 @@ class Operator(Node):
 
 
 class VariableAssignment(Node):
+    __slots__ = ('var', 'assign')
+
     def __init__(self, var: Symbol, assign: 'Assignment') -> None:
         super().__init__()
         self.var: Symbol = var
@@ -1165,6 +1518,8 @@ class VariableAssignment(Node):
 
 
 class Assignment(Node):
+    __slots__ = ('expr', 'operator')
+
     def __init__(self, expr: 'Expression') -> None:
         super().__init__()
         self.expr: Expression = expr
@@ -1178,6 +1533,8 @@ class Assignment(Node):
 
 
 class Declaration(DeclarationBase):
+    __slots__ = ('declaration_type', '_typ', 'typ_src', 'sym', '_qualifiers')
+
     def __init__(self, pos: int, typ: Symbol, sym: Optional['Identifier'], qualifiers: Qualifier
                  ) -> None:
         super().__init__(pos)
@@ -1210,7 +1567,7 @@ class Declaration(DeclarationBase):
         if not self.built:
             self._make_type()
         if self._typ is None:
-            return BuiltinType('@any')
+            return BuiltinType.get(self, '@any')
         return self._typ
 
     def _make_type(self) -> None:
@@ -1221,6 +1578,8 @@ class Declaration(DeclarationBase):
 
 
 class VariableDeclaration(Declaration):
+    __slots__ = ('_assign',)
+
     def __init__(self, typ: Symbol, sym: Optional['Identifier'],
                  assign: Optional[Union[Assignment, List['Expression']]] = None) -> None:
         super().__init__(0, typ, sym, Qualifier.NONE)
@@ -1306,11 +1665,26 @@ class VariableDeclaration(Declaration):
 
 class Function(Declaration, FlowScope):
     def __init__(self, pos: int, qualifiers: Qualifier, typ: 'TemplatedIdentifier',
-                 sym: 'Identifier', body_str: Optional[UnparsedContents] = None) -> None:
+                 sym: 'Identifier',
+                 body: Optional[Union[UnparsedContents, List['Statement']]] = None) -> None:
+        """! Constructor
+        @param pos @b int Position of the node in the source file.
+        @param qualifiers @b Qualifier Qualifiers of the function.
+        @param typ @b TemplatedIdentifier Type of the function.
+        @param sym @b Identifier Name of the function.
+        @param body @b Union[UnparsedContents, List[Statement]] Body of the function, either as
+            statements parsed along with the rest of the file, or as contents to be parsed when the
+            function is built. None for a declaration.
+        """
         super().__init__(pos, typ, sym, qualifiers)
         FlowScope.__init__(self, pos, [])
         self.this_cls: Optional[EhClass] = None
-        self.body_str: Optional[UnparsedContents] = body_str
+        self.body_str: Optional[UnparsedContents] = None
+        self._parsed_body: Optional[List[Statement]] = None
+        if isinstance(body, UnparsedContents):
+            self.body_str = body
+        else:
+            self._parsed_body = body
         self.gen_var_count: int = 0
 
     def build(self) -> 'Function':
@@ -1318,12 +1692,12 @@ class Function(Declaration, FlowScope):
         if self.is_child_of(Import):
             return self
         try:
-            assert isinstance(self.typ, FunctionType)
-            typ: Optional[DeclarationBase] = self.typ.ret.canonical
-            if self.body_str is None:
-                self._body = []
+            if self._parsed_body is not None:
+                self._body = self._parsed_body
+            elif self.body_str is not None:
+                self._body = function.parse(self.body_str.contents)
             else:
-                self._body = function.parse(self.body_str.contents, not typ == BuiltinType('@void'))
+                self._body = []
             for stmt in self.body:
                 stmt.parent = self
             super().build()
@@ -1335,6 +1709,29 @@ class Function(Declaration, FlowScope):
     def fail(self, severity: ParseError.Severity, pos: int, msg: str) -> None:
         super().fail(severity, pos if self.body_str is None else pos + self.body_str.pos, msg)
 
+    def set_parsed_body(self, body: List['Statement']) -> None:
+        """! Give this function its body, parsed out of its unparsed contents
+        @param body @b List[Statement] The parsed body, with positions relative to the contents
+        """
+        self._parsed_body = body
+
+    def drop_body(self) -> None:
+        """! Free the statements of this function, once it has been written
+        It is still a definition, but its body may not be written again.
+        """
+        if not self.has_body:
+            return
+        self._body = []
+        self._post_body = []
+        self._parsed_body = []
+        self.body_str = None
+        self.declarations = []
+
+    @property
+    def has_body(self) -> bool:
+        """! Whether this function is a definition, as opposed to a declaration. """
+        return self.body_str is not None or self._parsed_body is not None
+
     @property
     def qualifiers(self) -> Qualifier:
         return self._qualifiers
@@ -1380,6 +1777,8 @@ class Function(Declaration, FlowScope):
 
 
 class VArgs(VariableDeclaration):
+    __slots__ = ()
+
     def __init__(self, typ: Symbol) -> None:
         super().__init__(Array(typ, None), Identifier(0, 'vargs'))
 
@@ -1401,12 +1800,14 @@ class VArgs(VariableDeclaration):
 
 
 class VArgsLength(VariableDeclaration):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(CompoundIdentifier([Identifier(0, '@int')]), Identifier(0, 'vargs_len'))
 
     @property
     def typ(self) -> Type:
-        return self.make(BuiltinType('@int'))
+        return BuiltinType.get(self, '@int')
 
     @property
     def mangled_name(self) -> str:
@@ -1418,6 +1819,8 @@ class VArgsLength(VariableDeclaration):
 
 
 class Statement(Node):
+    __slots__ = ('expr',)
+
     def __init__(self, expr: Node) -> None:
         super().__init__()
         self.expr: Node = expr
@@ -1431,8 +1834,14 @@ class Statement(Node):
     def get_declaration(self, sym: str) -> DeclarationLookup:
         return self.expr.get_declaration(sym)
 
+    @property
+    def exposed_names(self) -> Optional[List[str]]:
+        return self.expr.exposed_names
+
 
 class Expression(Value):
+    __slots__ = ('contents', 'parenthesised')
+
     def __init__(self, contents: List[Value], parenthesised: bool) -> None:
         super().__init__()
         self.contents: List[Value] = contents
@@ -1459,6 +1868,8 @@ class Expression(Value):
 
 
 class InitializationList(Value):
+    __slots__ = ('contents',)
+
     def __init__(self, contents: List[Expression]) -> None:
         super().__init__()
         self.contents: List[Expression] = contents
@@ -1477,10 +1888,12 @@ class InitializationList(Value):
             n.auto_cast(tgt)
 
     def typ(self) -> Type:
-        return BuiltinType('@any')
+        return BuiltinType.get(self, '@any')
 
 
 class FunctionCall(Value):
+    __slots__ = ('sym', 'args', '_this_ptr')
+
     def __init__(self, pos: int, sym: Symbol, args: List[Expression]) -> None:
         super().__init__(pos)
         self.sym: Symbol = sym
@@ -1588,7 +2001,7 @@ class FunctionCall(Value):
     @property
     def typ(self) -> Type:
         if self.sym.decl is None:
-            return self.make(BuiltinType('@any'))
+            return BuiltinType.get(self, '@any')
         assert isinstance(self.sym.decl, Declaration)
         if not isinstance(self.sym.decl.typ, FunctionType):
             return self.sym.decl.typ
@@ -1614,6 +2027,8 @@ class FunctionCall(Value):
 
 
 class ArrayAccess(SymbolContainer):
+    __slots__ = ('idx',)
+
     def __init__(self, child: Symbol, idx: Expression) -> None:
         super().__init__(child)
         self.idx: Expression = idx
@@ -1694,6 +2109,8 @@ class ForDoLoop(ControlStructure):
 
 
 class Condition(Node):
+    __slots__ = ('branches',)
+
     def __init__(self, branches: List[ControlStructure]) -> None:
         super().__init__(0)
         self.branches: List[ControlStructure] = branches
@@ -1707,6 +2124,8 @@ class Condition(Node):
 
 
 class SwitchCase(Node):
+    __slots__ = ('cases', 'body')
+
     def __init__(self, cases: List['SwitchCaseTest'], body: 'SwitchCaseBody') -> None:
         super().__init__()
         self.cases: List[SwitchCaseTest] = cases
@@ -1723,6 +2142,8 @@ class SwitchCase(Node):
 
 
 class SwitchCaseTest(Node):
+    __slots__ = ('test',)
+
     def __init__(self, test: Optional[Value]) -> None:
         super().__init__()
         self.test: Optional[Value] = test
@@ -1747,21 +2168,29 @@ class SwitchCaseBody(FlowScope):
 
 
 class Return(Node):
-    def __init__(self, expr: Optional[Expression] = None) -> None:
-        super().__init__()
+    __slots__ = ('expr',)
+
+    def __init__(self, pos: int, expr: Optional[Expression] = None) -> None:
+        super().__init__(pos)
         self.expr: Optional[Expression] = expr
         if self.expr is not None:
             self.expr.parent = self
 
     def build(self) -> 'Return':
         super().build()
+        decl: Node = self.parent
+        while not isinstance(decl, Function):
+            decl = decl.parent
+        assert isinstance(decl.typ, FunctionType)
+        ret_typ: Optional[DeclarationBase] = decl.typ.ret.canonical
+        is_void: bool = BuiltinType.get(self, '@void') == ret_typ
         if self.expr is not None:
+            if is_void:
+                self.error(self.pos, 'returning a value from a void function')
             self.expr = self.expr.build()
-            decl: Node = self.parent
-            while not isinstance(decl, Function):
-                decl = decl.parent
-            assert isinstance(decl.typ, FunctionType)
             self.expr.auto_cast(decl.typ.ret)
+        elif ret_typ is not None and not is_void:
+            self.error(self.pos, 'missing return value in a non void function')
         self._finalize_scope()
         return self
 
@@ -1775,6 +2204,8 @@ class Return(Node):
 
 
 class Identifier(Value):
+    __slots__ = ('name', '_decl')
+
     def __init__(self, pos: int, name: str) -> None:
         super().__init__(pos)
         self.name: str = name
@@ -1788,12 +2219,14 @@ class Identifier(Value):
     @property
     def typ(self) -> Type:
         if self.decl is None:
-            return self.make(BuiltinType('@any'))
+            return BuiltinType.get(self, '@any')
+        if isinstance(self.decl, BuiltinType):
+            return self.decl
         if isinstance(self.decl, Type):
             return self.make(self.decl.dup())
         if isinstance(self.decl, (Declaration, Alias)):
             return self.decl.typ
-        return BuiltinType('@any')
+        return BuiltinType.get(self, '@any')
 
     @property
     def decl(self) -> Optional[DeclarationBase]:
@@ -1814,6 +2247,8 @@ class Identifier(Value):
 
 
 class CompoundIdentifier(Symbol):
+    __slots__ = ('elems',)
+
     def __init__(self, elems: List[Identifier]) -> None:
         self.elems: List[Identifier] = elems
         for elem in self.elems:
@@ -1896,6 +2331,8 @@ class CompoundIdentifier(Symbol):
 
 
 class TemplatedIdentifier(Symbol):
+    __slots__ = ('_name', 'types')
+
     def __init__(self, pos: int, name: str, types: List[Union[Symbol, Type]]) -> None:
         super().__init__()
         self._name: str = name
@@ -1933,6 +2370,8 @@ class TemplatedIdentifier(Symbol):
 
 
 class Cast(TemplatedIdentifier):
+    __slots__ = ('arg',)
+
     def __init__(self, pos: int, sym: Symbol, arg: Expression) -> None:
         super().__init__(pos, '@cast', [sym])
         self.arg: Expression = arg
@@ -1962,6 +2401,8 @@ class Cast(TemplatedIdentifier):
 
 
 class HeapAlloc(Value):
+    __slots__ = ('sym', 'args')
+
     def __init__(self, pos: int, sym: CompoundIdentifier, args: List[Expression]) -> None:
         super().__init__(pos)
         self.sym: CompoundIdentifier = sym
@@ -2017,6 +2458,8 @@ class HeapAlloc(Value):
 
 
 class HeapDealloc(Node):
+    __slots__ = ('sym',)
+
     def __init__(self, pos: int, sym: CompoundIdentifier) -> None:
         super().__init__(pos)
         self.sym: CompoundIdentifier = sym
@@ -2025,7 +2468,7 @@ class HeapDealloc(Node):
     def build(self) -> 'HeapDealloc':
         super().build()
         self.sym = self.sym.build()
-        self.sym.auto_cast(BuiltinType('@any'))
+        self.sym.auto_cast(BuiltinType.get(self, '@any'))
         self._destruct()
         return self
 
@@ -2042,83 +2485,97 @@ class HeapDealloc(Node):
 
 
 class String(Value):
+    __slots__ = ('string',)
+
     def __init__(self, string: str) -> None:
         super().__init__()
         self.string: str = string
 
     @property
     def typ(self) -> Type:
-        return self.make(BuiltinType('@str'))
+        return BuiltinType.get(self, '@str')
 
     def auto_cast(self, target: Union[Symbol, Type]) -> None:
         pass
 
 
 class Char(Value):
+    __slots__ = ('char',)
+
     def __init__(self, char: str) -> None:
         super().__init__()
         self.char: str = char
 
     @property
     def typ(self) -> Type:
-        return self.make(BuiltinType('@char'))
+        return BuiltinType.get(self, '@char')
 
     def auto_cast(self, target: Union[Symbol, Type]) -> None:
         pass
 
 
 class Number(Value):
+    __slots__ = ('num',)
+
     def __init__(self, num: str) -> None:
         super().__init__()
         self.num: str = num
 
     @property
     def typ(self) -> Type:
-        return self.make(BuiltinType('@int'))
+        return BuiltinType.get(self, '@int')
 
     def auto_cast(self, target: Union[Symbol, Type]) -> None:
         pass
 
 
 class DecimalNumber(Value):
+    __slots__ = ('num',)
+
     def __init__(self, num: str) -> None:
         super().__init__()
         self.num: str = num
 
     @property
     def typ(self) -> Type:
-        return self.make(BuiltinType('@float'))
+        return BuiltinType.get(self, '@float')
 
     def auto_cast(self, target: Union[Symbol, Type]) -> None:
         pass
 
 
 class NullValue(Value):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__()
 
     @property
     def typ(self) -> Type:
-        return self.make(BuiltinType('@any'))
+        return BuiltinType.get(self, '@any')
 
     def auto_cast(self, target: Union[Symbol, Type]) -> None:
         pass
 
 
 class BoolValue(Value):
+    __slots__ = ('val',)
+
     def __init__(self, val: bool) -> None:
         super().__init__()
         self.val: bool = val
 
     @property
     def typ(self) -> Type:
-        return self.make(BuiltinType('@bool'))
+        return BuiltinType.get(self, '@bool')
 
     def auto_cast(self, target: Union[Symbol, Type]) -> None:
         pass
 
 
 class UnaryOperatorValue(Value):
+    __slots__ = ('op', 'val')
+
     def __init__(self, op: str, val: Value) -> None:
         super().__init__()
         self.op: str = op
@@ -2143,14 +2600,16 @@ class UnaryOperatorValue(Value):
 
 
 class PrefixOperatorValue(UnaryOperatorValue):
-    pass
+    __slots__ = ()
 
 
 class SuffixOperatorValue(UnaryOperatorValue):
-    pass
+    __slots__ = ()
 
 
 class AnonymousArray(Value):
+    __slots__ = ('contents',)
+
     def __init__(self, pos: int, contents: List[Value]) -> None:
         super().__init__(pos)
         self.contents = contents
@@ -2177,6 +2636,8 @@ class AnonymousArray(Value):
 
 
 class Sizeof(Value):
+    __slots__ = ('sz_typ',)
+
     def __init__(self, sz_typ: Symbol) -> None:
         super().__init__()
         self.sz_typ: Symbol = sz_typ
@@ -2189,10 +2650,12 @@ class Sizeof(Value):
 
     @property
     def typ(self) -> Type:
-        return self.make(BuiltinType('@size'))
+        return BuiltinType.get(self, '@size')
 
 
 class Alias(Symbol, DeclarationBase):
+    __slots__ = ('declaration_type', 'src_sym', 'src', 'dst')
+
     def __init__(self, src: Union[Type, Symbol], dst: Identifier) -> None:
         super().__init__()
         DeclarationBase.__init__(self)
@@ -2215,7 +2678,7 @@ class Alias(Symbol, DeclarationBase):
     @property
     def typ(self) -> Type:
         if self.src is None:
-            return BuiltinType('@any')
+            return BuiltinType.get(self, '@any')
         if isinstance(self.src, Type):
             return self.src
         assert isinstance(self.src, Declaration)
@@ -2233,6 +2696,12 @@ class Alias(Symbol, DeclarationBase):
             return ''
         return self.dst.name
 
+    @property
+    def exposed_names(self) -> Optional[List[str]]:
+        # name stays empty until built, but the alias declares its destination name either way,
+        # and what a scope indexes a node with may not change
+        return [self.dst.name]
+
     @property
     def is_type(self) -> bool:
         return isinstance(self.src, Type)
@@ -2353,6 +2822,8 @@ class ClassMethod(Function):
 
 
 class ClassProperty(VariableDeclaration):
+    __slots__ = ()
+
     def __init__(self, typ: Symbol, sym: Optional['Identifier'], assign: Optional[Assignment] = None
                  ) -> None:
         super().__init__(typ, sym, assign)
@@ -2364,8 +2835,8 @@ class ClassProperty(VariableDeclaration):
 
 class Ctor(ClassMethod):
     def __init__(self, pos: int, qualifiers: Qualifier, typ: TemplatedIdentifier,
-                 body_str: Optional[UnparsedContents]) -> None:
-        super().__init__(pos, qualifiers, typ, Identifier(pos, '@ctor'), body_str)
+                 body: Optional[Union[UnparsedContents, List['Statement']]]) -> None:
+        super().__init__(pos, qualifiers, typ, Identifier(pos, '@ctor'), body)
 
     @property
     def mangled(self) -> str:
@@ -2381,8 +2852,8 @@ class Ctor(ClassMethod):
 
 class Dtor(ClassMethod):
     def __init__(self, pos: int, qualifiers: Qualifier, typ: TemplatedIdentifier,
-                 body_str: Optional[UnparsedContents]) -> None:
-        super().__init__(pos, qualifiers, typ, Identifier(pos, '@dtor'), body_str)
+                 body: Optional[Union[UnparsedContents, List['Statement']]]) -> None:
+        super().__init__(pos, qualifiers, typ, Identifier(pos, '@dtor'), body)
 
     @property
     def mangled(self) -> str:
@@ -2494,6 +2965,8 @@ class EhClass(Type, UnorderedScope):
 
 
 class ContainerStructureType(Type):
+    __slots__ = ('_decl',)
+
     def __init__(self, decl: Union[ContainerStructure, EhClass]) -> None:
         super().__init__()
         self._decl: Union[ContainerStructure, EhClass] = decl
@@ -2521,15 +2994,15 @@ class ContainerStructureType(Type):
 
 
 class StructType(ContainerStructureType):
-    pass
+    __slots__ = ()
 
 
 class UnionType(ContainerStructureType):
-    pass
+    __slots__ = ()
 
 
 class ClassType(ContainerStructureType):
-    pass
+    __slots__ = ()
 
 
 class EhEnum(Type, Scope):
@@ -2588,6 +3061,8 @@ class EhEnum(Type, Scope):
 
 
 class EnumField(Declaration):
+    __slots__ = ()
+
     def __init__(self, sym: Identifier, parent: EhEnum) -> None:
         super().__init__(sym.pos, CompoundIdentifier([Identifier(0, parent.name)]), sym,
                          Qualifier.NONE)
@@ -2667,7 +3142,7 @@ class AST(UnorderedScope):
         for node in self.nodes:
             node.parent = self
         self.failures: List[Failure] = []
-        self.parser: Optional[ParserPython] = None
+        self.source_file: Optional[SourceFile] = None
         self.gen_var_count: int = 0
 
     def __iter__(self) -> Iterator[Node]:
@@ -2683,9 +3158,19 @@ class AST(UnorderedScope):
         raise Exception('AST.build may not be called')
 
     def build_ast(self, args: OptionsStruct) -> None:
+        for _ in self.build_nodes(args):
+            pass
+
+    def build_nodes(self, args: OptionsStruct) -> Iterator[Node]:
+        """! Build the nodes of the AST one at a time
+        @param args @b OptionsStruct Options of the build
+        @return @b Iterator[Node] Each top-level node, as soon as it is built
+        @throw ParseError Once all the nodes are built, if any of them failed
+        """
         global imported
         global included
         imported = included = []
+        dependencies.clear()
         super().build()
         self.declarations: List[DeclarationBase] = [
             FunctionType(CompoundIdentifier([Identifier(0, '@any')]), []),
@@ -2697,35 +3182,69 @@ class AST(UnorderedScope):
             BuiltinType('@str'), BuiltinType('@any'),
         ]
         self.declarations = [self.make(decl) for decl in self.declarations]
+        builtin_types.clear()
+        builtin_types.update((d.name, d) for d in self.declarations if isinstance(d, BuiltinType))
         self._import_paths = [
             path.dirname(args.source),
             getcwd(),
             path.dirname(args.output_import_file)]
 
-        self.nodes = [n.build() for n in self.nodes]
+        c_header.preload([n.lib for n in self.nodes if isinstance(n, Include)])
+        if function.jobs > 1:
+            function.parse_bodies(self.function_definitions)
+        built: List[Node] = []
+        for n in self.nodes:
+            built.append(n.build())
+            yield built[-1]
+        self.nodes = built
         if len(self.failures) != 0:
-            raise ParseError(self.failures, self.parser)
+            raise ParseError(self.failures, self.source_file)
+
+    @property
+    def function_definitions(self) -> List['Function']:
+        """! @c property @b List[Function] Functions of this file, including methods and the
+        functions of namespaces
+        """
+        return self.functions_of(self.nodes)
+
+    @staticmethod
+    def functions_of(top_level: List[Node]) -> List['Function']:
+        """! Find the functions of top-level nodes
+        @param top_level @b List[Node] The nodes
+        @return @b List[Function] The functions among the nodes, including methods and the functions
+            of namespaces
+        """
+        res: List[Function] = []
+        nodes: List[Node] = list(reversed(top_level))
+        while len(nodes) != 0:
+            node: Node = nodes.pop()
+            if isinstance(node, Function):
+                res.append(node)
+            elif isinstance(node, EhClass) and node.contents is not None:
+                nodes.extend(reversed(node.contents))
+            elif isinstance(node, Namespace):
+                nodes.extend(reversed(node.scope_contents))
+        return res
 
     def fail(self, severity: ParseError.Severity, pos: int, msg: str) -> None:
-        assert self.parser is not None
-        self.failures.append(Failure(severity, pos, msg, self.parser.file_name))
+        assert self.source_file is not None
+        self.failures.append(Failure(severity, pos, msg, self.source_file.file_name))
 
     @property
     def scope_contents(self) -> List[Node]:
         return self.nodes
 
     def find_declaration(self, sym: str) -> DeclarationLookup:
-        res: DeclarationLookup = DeclarationLookup(sym, self.nodes)
-        for decl in self.declarations:
-            found = decl.get_declaration(sym)
-            if len(found) > 0:
-                for f in found:
-                    if isinstance(f, Type):
-                        res.append(self.make(f.dup()))
-                    else:
-                        res.append(f)
-            else:
-                res.merge(found)
+        res: DeclarationLookup = self.contents_index.find(sym)
+        found: DeclarationLookup = self.declarations_index.find(sym)
+        if len(found) > 0:
+            for f in found:
+                if isinstance(f, Type) and not isinstance(f, BuiltinType):
+                    res.append(self.make(f.dup()))
+                else:
+                    res.append(f)
+        else:
+            res.merge(found)
         return res
 
     @property
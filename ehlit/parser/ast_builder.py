@@ -57,6 +57,7 @@ ComparisonSequence = Tuple[ast.Value, StrMatch, ast.Value, StrMatch, ast.Value]
 ControlStructureArgs = Tuple[ast.Expression, List[ast.Statement]]
 ForDoInitializer = Union[ast.VariableDeclaration, ast.VariableAssignment]
 ForDoAction = Union[ast.Expression, ast.VariableAssignment]
+FunctionBody = Union[ast.UnparsedContents, List[ast.Statement]]
 
 
 class ASTBuilder(PTNodeVisitor):
@@ -368,11 +369,14 @@ class ASTBuilder(PTNodeVisitor):
         typed_children[1].set_child(typed_children[0])
         return ast.VariableAssignment(typed_children[1].to_array_access(), typed_children[2])
 
+    def visit_return_value_ahead(self, node: ParseTreeNode, children: Tuple[RegExMatch]) -> None:
+        return None
+
     def visit_return_instruction(self, node: ParseTreeNode,
                                  children: Tuple[StrMatch, ast.Expression]) -> ast.Return:
-        if len(children) == 0:
-            return ast.Return()
-        return ast.Return(children[1])
+        if len(children) == 1:
+            return ast.Return(node.position)
+        return ast.Return(node.position, children[1])
 
     def visit_statement(self, node: ParseTreeNode, children: Tuple[ast.Node]) -> ast.Statement:
         return ast.Statement(children[0])
@@ -516,6 +520,14 @@ class ASTBuilder(PTNodeVisitor):
                                           ) -> ast.UnparsedContents:
         return ast.UnparsedContents(children[0], node.position)
 
+    def visit_function_body(self, node: ParseTreeNode,
+                            children: Tuple[Union[ast.UnparsedContents, Tuple[ast.Statement]]]
+                            ) -> FunctionBody:
+        body = children[0]
+        if isinstance(body, ast.UnparsedContents):
+            return body
+        return list(body)
+
     # Functions
     ###########
 
@@ -572,9 +584,9 @@ class ASTBuilder(PTNodeVisitor):
 
     def parse_function_definition(self,
                                   children: Tuple[Tuple[ast.TemplatedIdentifier, ast.Identifier],
-                                                  ast.UnparsedContents]
+                                                  FunctionBody]
                                   ) -> Tuple[ast.Qualifier, ast.TemplatedIdentifier, ast.Identifier,
-                                             ast.UnparsedContents, bool]:
+                                             FunctionBody, bool]:
         qualifiers: ast.Qualifier = ast.Qualifier.NONE
         cdecl: bool = False
         i: int = 0
@@ -587,14 +599,14 @@ class ASTBuilder(PTNodeVisitor):
                 cdecl = True
             i += 1
         body = children[i + 1]
-        assert isinstance(body, ast.UnparsedContents)
+        assert isinstance(body, (ast.UnparsedContents, list))
         decl = children[i]
         assert isinstance(decl, tuple)
         return qualifiers, decl[0], decl[1], body, cdecl
 
     def visit_function_definition(self, node: ParseTreeNode,
                                   children: Tuple[Tuple[ast.TemplatedIdentifier, ast.Identifier],
-                                                  ast.UnparsedContents]
+                                                  FunctionBody]
                                   ) -> ast.Function:
         qualifiers, typ, sym, body, cdecl = self.parse_function_definition(children)
         res = ast.Function(node.position, qualifiers, typ, sym, body)
@@ -669,7 +681,7 @@ class ASTBuilder(PTNodeVisitor):
     def visit_constructor(self, node: ParseTreeNode,
                           children: Tuple[str, Tuple[List[ast.VariableDeclaration],
                                                      Optional[ast.Symbol]],
-                                          ast.UnparsedContents]
+                                          FunctionBody]
                           ) -> ast.Ctor:
         qualifiers: ast.Qualifier = ast.Qualifier.NONE
         i: int = 0
@@ -685,7 +697,7 @@ class ASTBuilder(PTNodeVisitor):
         args: List[ast.VariableDeclaration]
         variadic_type: Optional[ast.Symbol]
         body = None
-        if len(children) < i or isinstance(children[i], ast.UnparsedContents):
+        if len(children) < i or isinstance(children[i], (ast.UnparsedContents, list)):
             args = []
             variadic_type = None
             if len(children) > i:
@@ -702,10 +714,10 @@ class ASTBuilder(PTNodeVisitor):
             variadic_type is not None,
             variadic_type
         )])
-        assert(body is None or isinstance(body, ast.UnparsedContents))
+        assert(body is None or isinstance(body, (ast.UnparsedContents, list)))
         return ast.Ctor(node.position, qualifiers, typ, body)
 
-    def visit_destructor(self, node: ParseTreeNode, children: Tuple[str, ast.UnparsedContents]
+    def visit_destructor(self, node: ParseTreeNode, children: Tuple[str, FunctionBody]
                          ) -> ast.Dtor:
         qualifiers: ast.Qualifier = ast.Qualifier.NONE
         i: int = 0
@@ -725,12 +737,12 @@ class ASTBuilder(PTNodeVisitor):
             ast.CompoundIdentifier([ast.Identifier(node.position, '@void')]),
             []
         )])
-        assert(body is None or isinstance(body, ast.UnparsedContents))
+        assert(body is None or isinstance(body, (ast.UnparsedContents, list)))
         return ast.Dtor(node.position, qualifiers, typ, body)
 
     def visit_class_method(self, node: ParseTreeNode,
                            children: Tuple[Tuple[ast.TemplatedIdentifier, ast.Identifier],
-                                           ast.UnparsedContents]) -> ast.ClassMethod:
+                                           FunctionBody]) -> ast.ClassMethod:
         qualifiers, typ, sym, body, cdecl = self.parse_function_definition(children)
         res = ast.ClassMethod(node.position, qualifiers, typ, sym, body)
         if cdecl:
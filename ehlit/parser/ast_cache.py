@@ -0,0 +1,122 @@
+# Copyright © 2019 Cedric Legrand
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice (including the next
+# paragraph) shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import hashlib
+import pickle
+from os import fdopen, makedirs, path, replace, walk
+from tempfile import mkstemp
+from typing import Optional
+
+from ehlit.parser.ast import AST
+
+## @b Optional[str] Directory where parsed sources are cached, None to disable the cache.
+directory: Optional[str] = None
+
+_compiler_version: Optional[str] = None
+
+
+def compiler_version() -> str:
+    """!
+    Get a fingerprint of the compiler.
+
+    An AST is only valid for the compiler that produced it, so cached ones are keyed by this too.
+    It is computed from the sources of the compiler, so that any change to it invalidates the
+    cache, even without bumping a version number.
+    @return @b str The fingerprint of the running compiler
+    """
+    global _compiler_version
+    if _compiler_version is None:
+        h = hashlib.sha256()
+        root: str = path.dirname(path.dirname(path.abspath(__file__)))
+        for dir_path, dirs, files in walk(root):
+            dirs.sort()
+            for f in sorted(files):
+                if f.endswith('.py'):
+                    h.update(f.encode())
+                    with open(path.join(dir_path, f), 'rb') as src:
+                        h.update(src.read())
+        _compiler_version = h.hexdigest()
+    return _compiler_version
+
+
+def _entry_path(contents: str, deferred_bodies: bool) -> str:
+    assert directory is not None
+    h = hashlib.sha256(compiler_version().encode())
+    # Deferred function bodies are left unparsed in the AST, which is then not the same
+    h.update(b'deferred' if deferred_bodies else b'full')
+    h.update(contents.encode())
+    return path.join(directory, h.hexdigest())
+
+
+def load(source: str, contents: str, deferred_bodies: bool = False) -> Optional[AST]:
+    """! Load the AST of a source file from the cache
+    @param source @b str Path of the source file
+    @param contents @b str Contents of the source file
+    @param deferred_bodies @b bool Whether the AST has been parsed with deferred function bodies
+    @return @b Optional[AST] The unbuilt AST of the source file, or None if it is not cached
+    """
+    if directory is None:
+        return None
+    try:
+        with open(_entry_path(contents, deferred_bodies), 'rb') as f:
+            res = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # A broken entry is only a miss, it will be overwritten once the file is parsed again
+        return None
+    if not isinstance(res, AST):
+        return None
+    # The same contents may come from another file
+    if res.source_file is not None:
+        res.source_file.file_name = source
+    return res
+
+
+def contains(contents: str, deferred_bodies: bool = False) -> bool:
+    """! Check whether the AST of a source file is cached, without loading it
+    @param contents @b str Contents of the source file
+    @param deferred_bodies @b bool Whether the AST has been parsed with deferred function bodies
+    @return @b bool True if load would find it
+    """
+    return directory is not None and path.isfile(_entry_path(contents, deferred_bodies))
+
+
+def store(contents: str, ast: AST, deferred_bodies: bool = False) -> None:
+    """! Store the AST of a source file in the cache
+    @param contents @b str Contents of the source file
+    @param ast @b AST The unbuilt AST of the source file
+    @param deferred_bodies @b bool Whether the AST has been parsed with deferred function bodies
+    """
+    if directory is None:
+        return
+    entry: str = _entry_path(contents, deferred_bodies)
+    try:
+        data: bytes = pickle.dumps(ast, pickle.HIGHEST_PROTOCOL)
+    except RecursionError:
+        # Too deep to be serialized, it will simply be parsed each time
+        return
+    makedirs(directory, exist_ok=True)
+    # Write to a temporary file first, so that concurrent builds never read a partial entry
+    fd, tmp = mkstemp(dir=directory, suffix='.tmp')
+    with fdopen(fd, 'wb') as f:
+        f.write(data)
+    replace(tmp, entry)
@@ -21,17 +21,128 @@
 
 import os
 import glob
+import hashlib
+import json
 import logging
+import pickle
+import shutil
 import subprocess
 from argparse import ArgumentParser
+from tempfile import mkstemp
 from clang.cindex import (Index, TranslationUnitLoadError, CursorKind, TypeKind, Cursor, Type,
-                          TranslationUnit, TokenKind, Token, Config)
+                          TranslationUnit, TokenKind, Token, Config, File)
 from ehlit.parser.error import ParseError, Failure
 from ehlit.parser import ast
-from typing import cast, Dict, List, Optional, Set
+from typing import Any, cast, Dict, Iterable, List, Optional, Set, Tuple
+
+
+## @b Optional[str] File where the discovered C toolchain is kept, None to discover it each time.
+cache_file: Optional[str] = None
+## @b Optional[str] Directory where translated headers are cached, None to disable the cache.
+cache_directory: Optional[str] = None
+## @b bool Whether the headers included by a source are parsed at once, see preload.
+merge_includes: bool = True
+
+
+class Toolchain:
+    """! What is needed from the installed Clang to parse C headers """
+
+    def __init__(self, library: Optional[str], include_dirs: List[str],
+                 builtin_defines: List[str]) -> None:
+        """! Constructor
+        @param library @b Optional[str] Path of the Clang library, None to let cindex find it
+        @param include_dirs @b List[str] Directories where included headers are looked for
+        @param builtin_defines @b List[str] Macros defined by Clang itself
+        """
+        ## @b Optional[str] Path of the Clang library, None to let cindex find it.
+        self.library: Optional[str] = library
+        ## @b List[str] Directories where included headers are looked for.
+        self.include_dirs: List[str] = include_dirs
+        ## @b Set[str] Macros defined by Clang itself. We do not want to expose them, as they are
+        ## too much specific and could change between the Ehlit build and the C build.
+        self.builtin_defines: Set[str] = set(builtin_defines)
+
+
+_toolchain: Optional[Toolchain] = None
+_shared_index: Optional[Index] = None
+## @b Dict[str, List[Node]] Declarations of the headers parsed by preload, until parse asks for
+## them.
+_preloaded: Dict[str, List[ast.Node]] = {}
+## @b List[Tuple[CompoundIdentifier, str]] Types aliased by the macros of the header being parsed,
+## with the placeholders standing for them until they are resolved by _resolve_macro_types.
+_pending_types: List[Tuple[ast.CompoundIdentifier, str]] = []
+
+
+def toolchain() -> Toolchain:
+    """!
+    Get the C toolchain.
+
+    Finding it takes a few runs of Clang, which most sources do not need, as they include no C
+    header. So it is only done the first time a header is parsed, and kept in cache_file for the
+    next runs.
+    @return @b Toolchain The C toolchain
+    """
+    global _toolchain
+    if _toolchain is None:
+        key: Dict[str, Any] = _toolchain_key()
+        _toolchain = _load_toolchain(key)
+        if _toolchain is None:
+            _toolchain = _find_toolchain()
+            _store_toolchain(key, _toolchain)
+        elif _toolchain.library is not None and not Config.loaded:
+            Config.set_library_file(_toolchain.library)
+    return _toolchain
+
+
+def _toolchain_key() -> Dict[str, Any]:
+    # Clang is identified by its executables rather than by its version, so that a cached
+    # toolchain can be checked without running any of them. Upgrading Clang replaces them anyway.
+    tools: Dict[str, Any] = {}
+    for tool in ('llvm-config', 'clang'):
+        found: Optional[str] = shutil.which(tool)
+        if found is not None:
+            st: os.stat_result = os.stat(found)
+            tools[tool] = [os.path.realpath(found), st.st_mtime_ns, st.st_size]
+    return {'tools': tools, 'cflags': os.environ.get('CFLAGS')}
+
+
+def _load_toolchain(key: Dict[str, Any]) -> Optional[Toolchain]:
+    if cache_file is None:
+        return None
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data: Any = json.load(f)
+        if data['key'] != key:
+            return None
+        return Toolchain(data['library'], data['include_dirs'], data['builtin_defines'])
+    except Exception:
+        # A broken cache is only a miss, it will be overwritten once the toolchain is found again
+        return None
+
 
+def _store_toolchain(key: Dict[str, Any], res: Toolchain) -> None:
+    if cache_file is None:
+        return
+    directory: str = os.path.dirname(cache_file) or '.'
+    os.makedirs(directory, exist_ok=True)
+    # Write to a temporary file first, so that concurrent builds never read a partial cache
+    fd, tmp = mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump({'key': key, 'library': res.library, 'include_dirs': res.include_dirs,
+                   'builtin_defines': sorted(res.builtin_defines)}, f)
+    os.replace(tmp, cache_file)
 
-def find_clang_posix() -> None:
+
+def _find_toolchain() -> Toolchain:
+    library: Optional[str] = None
+    if os.name == 'posix':
+        library = find_clang_posix()
+        if not Config.loaded:
+            Config.set_library_file(library)
+    return Toolchain(library, _get_include_dirs(), _get_builtin_defines())
+
+
+def find_clang_posix() -> str:
     # Find the clang library. On some distros, the clang library is not called `libclang.so`, for
     # example on Ubuntu, it is `libclang.so.1`, making cindex unable to find it.
     proc: subprocess.CompletedProcess = subprocess.run(['llvm-config', '--libdir'],
@@ -46,87 +157,92 @@ def find_clang_posix() -> None:
     clang_libs: List[str] = glob.glob(os.path.join(proc.stdout.strip(), 'libclang.so*'))
     if len(clang_libs) == 0:
         raise RuntimeError('Could not find libclang.so, make sure Clang is installed')
-    Config.set_library_file(clang_libs[0])
-
-
-if os.name == 'posix':
-    find_clang_posix()
-
-
-include_dirs: List[str] = []
-
-# Add CFLAGS environment variable include dirs
-parser: ArgumentParser = ArgumentParser()
-parser.add_argument('-I', dest='dirs', default=[], action='append')
-try:
-    args, unknown = parser.parse_known_args(os.environ['CFLAGS'].split())
-    for d in args.dirs:
-        include_dirs += d
-except KeyError:
-    # Silently continue if there is no CFLAGS environment variable
-    pass
-
-
-try:
-    # Run clang without input in verbose mode just to get its default include directories to have an
-    # environment as close to upcoming build as possible. There will be differences do it like this,
-    # but:
-    # - We know we have clang as we rely on its library for parsing. At least it becomes a minor
-    #   dependency.
-    # - It is ways easier and more reliable than supporting each and every system / (cross) compiler
-    #   combo out there
-    # - They should be quite the same than the ones actually used
-    # - Only differences should be minor / internal enough to not have consequences on ehlit code
-    proc = subprocess.run(['clang', '-E', '-v', '-'], stdin=subprocess.PIPE, stderr=subprocess.PIPE,
-                          stdout=subprocess.PIPE, encoding='utf-8')
-
-    if proc.returncode != 0:
-        # Just to stop the execution of the try block
-        raise Exception('')
-
-    i1: Optional[int] = None
-    i2: Optional[int] = None
-    lines: List[str] = proc.stderr.split('\n')
-    for i, line in enumerate(lines):
-        if line == '#include "..." search starts here:':
-            i1 = i
-        elif line == 'End of search list.':
-            i2 = i
+    return clang_libs[0]
 
-    # Should not happen unless clang changes its output, which is very unlikely
-    assert i1 is not None and i2 is not None and i1 < i2
-    lines = lines[i1 + 1:i2]
-    lines.remove('#include <...> search starts here:')
-    include_dirs += [l.strip() for l in lines]
 
-except Exception:
-    logging.warning('failed to get default include directories')
-
-# Yups, mixing multiple languages in the same directory would be very disapointing, but who knows...
-include_dirs.append('.')
+def _get_include_dirs() -> List[str]:
+    include_dirs: List[str] = []
 
+    # Add CFLAGS environment variable include dirs
+    parser: ArgumentParser = ArgumentParser()
+    parser.add_argument('-I', dest='dirs', default=[], action='append')
+    try:
+        args, unknown = parser.parse_known_args(os.environ['CFLAGS'].split())
+        include_dirs += args.dirs
+    except KeyError:
+        # Silently continue if there is no CFLAGS environment variable
+        pass
 
-# Build an empty file to get a list of builtin Clang macros. We do not want to expose them, as they
-# are too much specific and could change between the Ehlit build and the C build.
+    try:
+        # Run clang without input in verbose mode just to get its default include directories to
+        # have an environment as close to upcoming build as possible. There will be differences do
+        # it like this, but:
+        # - We know we have clang as we rely on its library for parsing. At least it becomes a
+        #   minor dependency.
+        # - It is ways easier and more reliable than supporting each and every system / (cross)
+        #   compiler combo out there
+        # - They should be quite the same than the ones actually used
+        # - Only differences should be minor / internal enough to not have consequences on ehlit
+        #   code
+        proc = subprocess.run(['clang', '-E', '-v', '-'], stdin=subprocess.PIPE,
+                              stderr=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf-8')
+
+        if proc.returncode != 0:
+            # Just to stop the execution of the try block
+            raise Exception('')
+
+        i1: Optional[int] = None
+        i2: Optional[int] = None
+        lines: List[str] = proc.stderr.split('\n')
+        for i, line in enumerate(lines):
+            if line == '#include "..." search starts here:':
+                i1 = i
+            elif line == 'End of search list.':
+                i2 = i
+
+        # Should not happen unless clang changes its output, which is very unlikely
+        assert i1 is not None and i2 is not None and i1 < i2
+        lines = lines[i1 + 1:i2]
+        lines.remove('#include <...> search starts here:')
+        include_dirs += [l.strip() for l in lines]
+
+    except Exception:
+        logging.warning('failed to get default include directories')
+
+    # Yups, mixing multiple languages in the same directory would be very disapointing, but who
+    # knows...
+    include_dirs.append('.')
+    return include_dirs
+
+
+# Build an empty file to get a list of builtin Clang macros.
 def _get_builtin_defines() -> List[str]:
     defs: List[str] = []
-    index: Index = Index.create()
-    tu: TranslationUnit = index.parse('builtins.h',
-                                      options=TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD,
-                                      unsaved_files=[('builtins.h', '')])
+    tu: TranslationUnit = _index().parse('builtins.h',
+                                         options=TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD,
+                                         unsaved_files=[('builtins.h', '')])
     for c in tu.cursor.get_children():
         if c.kind == CursorKind.MACRO_DEFINITION:
             toks = list(c.get_tokens())
             defs.append(toks[0].spelling)
     del tu
-    del index
     return defs
 
 
-builtin_defines: List[str] = _get_builtin_defines()
+def _index() -> Index:
+    """! Get the libclang index all translation units are parsed with
+    It may only be called once the Clang library is set up, see toolchain.
+    @return @b Index The index of the process
+    """
+    global _shared_index
+    if _shared_index is None:
+        _shared_index = Index.create()
+    return _shared_index
 
 
 class CDefine(ast.Declaration):
+    __slots__ = ()
+
     def __init__(self, sym: ast.Identifier) -> None:
         super().__init__(
             0,
@@ -152,6 +268,8 @@ class CMacroFunction(ast.Function):
 
 
 class CAnyType(ast.Type):
+    __slots__ = ()
+
     @staticmethod
     def make_symbol() -> ast.Symbol:
         return ast.CompoundIdentifier([ast.Identifier(0, '@c_any')])
@@ -239,7 +357,7 @@ def value_to_ehlit(val: str, typ: Type) -> Optional[ast.Expression]:
 
 
 def find_file_in_path(filename: str) -> str:
-    for d in include_dirs:
+    for d in toolchain().include_dirs:
         path = os.path.join(d, filename)
         if os.path.isfile(path):
             return path
@@ -247,25 +365,190 @@ def find_file_in_path(filename: str) -> str:
                               '%s: no such file or directory' % filename, None)])
 
 
+def _cache_entry(paths: List[str]) -> Optional[str]:
+    if cache_directory is None:
+        return None
+    from ehlit.parser.ast_cache import compiler_version
+    key: str = json.dumps([compiler_version(), _toolchain_key(), toolchain().include_dirs,
+                           [os.path.abspath(p) for p in paths]])
+    return os.path.join(cache_directory, hashlib.sha256(key.encode()).hexdigest())
+
+
+def _load_entry(entry: str) -> Optional[Any]:
+    try:
+        with open(entry, 'rb') as f:
+            deps: Dict[str, int]
+            deps, res = pickle.load(f)
+        # Any change to the headers, or to the files they include, invalidates the entry
+        for dep, mtime in deps.items():
+            if os.stat(dep).st_mtime_ns != mtime:
+                return None
+    except Exception:
+        # A broken or outdated entry is only a miss, it will be overwritten once parsed again
+        return None
+    ast.dependencies.update(deps)
+    return res
+
+
+def _dependencies(tu: TranslationUnit, paths: List[str]) -> List[str]:
+    deps: List[str] = paths + [inc.include.name for inc in tu.get_includes()]
+    ast.dependencies.update(deps)
+    return deps
+
+
+def _store_entry(entry: str, deps: List[str], res: Any) -> None:
+    assert cache_directory is not None
+    try:
+        data: bytes = pickle.dumps(({dep: os.stat(dep).st_mtime_ns for dep in deps}, res),
+                                   pickle.HIGHEST_PROTOCOL)
+    except (OSError, RecursionError):
+        return
+    os.makedirs(cache_directory, exist_ok=True)
+    # Write to a temporary file first, so that concurrent builds never read a partial entry
+    fd, tmp = mkstemp(dir=cache_directory, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, entry)
+
+
+def _translate(cursors: Iterable[Cursor],
+               origins: Optional[Dict[int, Optional[str]]] = None) -> List[ast.Node]:
+    result: List[ast.Node] = [CAnyType()]
+    _pending_types.clear()
+    for c in cursors:
+        node: Optional[ast.Node] = cursor_to_ehlit(c)
+        if node is not None:
+            result.append(node)
+            if origins is not None:
+                origins[id(node)] = None if c.location.file is None else c.location.file.name
+    return _resolve_macro_types(result)
+
+
 def parse(filename: str) -> List[ast.Node]:
+    """!
+    Translate the declarations of a C header to Ehlit.
+
+    Parsing a header with libclang takes far longer than building most Ehlit sources, and system
+    headers hardly ever change. So the translations are kept in cache_directory, until the header
+    or any file it includes is modified. Those files are added to ast.dependencies.
+    @param filename @b str The header, as it is included
+    @return @b List[Node] The unbuilt Ehlit declarations of the header
+    """
+    preloaded: Optional[List[ast.Node]] = _preloaded.pop(filename, None)
+    if preloaded is not None:
+        return preloaded
     path: str = find_file_in_path(filename)
-    index: Index = Index.create()
+    entry: Optional[str] = _cache_entry([path])
+    if entry is not None:
+        cached: Optional[List[ast.Node]] = _load_entry(entry)
+        if cached is not None:
+            return cached
     try:
-        tu: TranslationUnit = index.parse(path,
-                                          options=TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD)
+        tu: TranslationUnit = _index().parse(
+            path, options=TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD)
     except TranslationUnitLoadError:
         raise ParseError([Failure(ParseError.Severity.Error, 0, '%s: parsing failed' % filename,
                                   None)])
-    result: List[ast.Node] = [CAnyType()]
-    for c in tu.cursor.get_children():
-        node: Optional[ast.Node] = cursor_to_ehlit(c)
-        if node is not None:
-            result.append(node)
+    result: List[ast.Node] = _translate(tu.cursor.get_children())
+    deps: List[str] = _dependencies(tu, [path])
+    if entry is not None:
+        _store_entry(entry, deps, result)
     del tu
-    del index
     return result
 
 
+def preload(filenames: List[str]) -> None:
+    """!
+    Parse the headers included by a source at once, ahead of parse.
+
+    Headers mostly include the same files, such as the internals of the C library, which separate
+    parses go through again for each header. A single translation unit including all the headers
+    goes through them once, and each header gets back the declarations of the files it includes.
+    A declaration guarded by a macro which several headers define it under is only given to the
+    first of them, which makes no difference to the source including them all.
+    @param filenames @b List[str] The headers, as they are included
+    """
+    _preloaded.clear()
+    if not merge_includes:
+        return
+    paths: Dict[str, str] = {}
+    for filename in dict.fromkeys(filenames):
+        try:
+            paths[filename] = os.path.abspath(find_file_in_path(filename))
+        except ParseError:
+            # Reported when the header gets parsed on its own
+            pass
+    if len(paths) < 2:
+        return
+    entry: Optional[str] = _cache_entry(list(paths.values()))
+    if entry is not None:
+        cached: Optional[Dict[str, List[ast.Node]]] = _load_entry(entry)
+        if cached is not None:
+            _preloaded.update(cached)
+            return
+    contents: str = ''.join('#include "{}"\n'.format(p) for p in paths.values())
+    try:
+        tu: TranslationUnit = _index().parse(
+            'ehlit_includes.c', options=TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD,
+            unsaved_files=[('ehlit_includes.c', contents)])
+    except TranslationUnitLoadError:
+        # Each header will be parsed on its own
+        return
+    cursors: List[Cursor] = list(tu.cursor.get_children())
+    includes: Dict[str, Set[str]] = _includes(cursors)
+    reached: Dict[str, Set[str]] = {filename: _included_files(path, includes)
+                                    for filename, path in paths.items()}
+    all_files: Set[str] = set().union(*reached.values())
+    # Each declaration is translated once, the headers including the same file get copies of it
+    origins: Dict[int, Optional[str]] = {}
+    translated: List[ast.Node] = _translate(
+        (c for c in cursors if c.location.file is None or c.location.file.name in all_files),
+        origins)
+    used: Set[int] = set()
+    for filename, files in reached.items():
+        nodes: List[ast.Node] = [node for node in translated
+                                 if origins.get(id(node)) is None or origins[id(node)] in files]
+        shared: List[int] = [i for i, node in enumerate(nodes) if id(node) in used]
+        used.update(id(node) for node in nodes)
+        # Copying through pickle is much faster than deepcopy, and keeps the references between
+        # the copied nodes
+        copies: List[ast.Node] = pickle.loads(pickle.dumps([nodes[i] for i in shared],
+                                                           pickle.HIGHEST_PROTOCOL))
+        for i, copied in zip(shared, copies):
+            nodes[i] = copied
+        _preloaded[filename] = nodes
+    deps: List[str] = _dependencies(tu, list(paths.values()))
+    if entry is not None:
+        _store_entry(entry, deps, dict(_preloaded))
+    del tu
+
+
+def _includes(cursors: List[Cursor]) -> Dict[str, Set[str]]:
+    # Inclusions are taken from the directives rather than from TranslationUnit.get_includes, which
+    # leaves out those of headers already included, and guarded against a second inclusion
+    res: Dict[str, Set[str]] = {}
+    for c in cursors:
+        if c.kind == CursorKind.INCLUSION_DIRECTIVE and c.location.file is not None:
+            try:
+                included: File = c.get_included_file()
+            except AssertionError:
+                # The file could not be found
+                continue
+            res.setdefault(c.location.file.name, set()).add(included.name)
+    return res
+
+
+def _included_files(path: str, includes: Dict[str, Set[str]]) -> Set[str]:
+    res: Set[str] = {path}
+    todo: List[str] = [path]
+    while len(todo) != 0:
+        for included in includes.get(todo.pop(), ()):
+            if included not in res:
+                res.add(included)
+                todo.append(included)
+    return res
+
+
 def parse_VAR_DECL(cursor: Cursor) -> ast.Node:
     assign: Optional[Cursor] = cursor.get_definition()
     value: Optional[ast.Expression] = None
@@ -366,7 +649,7 @@ def parse_ENUM_DECL(cursor: Cursor) -> ast.Node:
 
 def parse_MACRO_DEFINITION(cursor: Cursor) -> Optional[ast.Node]:
     tokens: List[Token] = list(cursor.get_tokens())
-    if tokens[0].spelling in builtin_defines:
+    if tokens[0].spelling in toolchain().builtin_defines:
         return None
 
     sym: ast.Identifier = ast.Identifier(0, tokens[0].spelling)
@@ -426,23 +709,49 @@ def _macro_alias_value(tokens: List[Token]) -> Optional[ast.Symbol]:
 
 
 def _macro_alias_type(tokens: List[Token]) -> Optional[ast.Symbol]:
-    tokens_str: List[str] = []
-    for tok in tokens:
-        tokens_str.append(tok.spelling)
-    res: Optional[ast.Symbol] = None
-    index: Index = Index.create()
+    # Parsing the type right now would take a translation unit for each macro, so it is only
+    # given a placeholder, replaced by _resolve_macro_types with all the others of the header
+    placeholder: ast.CompoundIdentifier = ast.CompoundIdentifier([])
+    _pending_types.append((placeholder, ' '.join(tok.spelling for tok in tokens)))
+    return placeholder
+
+
+def _resolve_macro_types(nodes: List[ast.Node]) -> List[ast.Node]:
+    """! Resolve the types aliased by the macros of a header
+    Each type gets a variable declared in a single translation unit, which is parsed once.
+    @param nodes @b List[Node] The declarations of the header
+    @return @b List[Node] The declarations, without the aliases whose type could not be resolved
+    """
+    if len(_pending_types) == 0:
+        return nodes
+    prefix: str = 'ehlit_macro_type_'
+    contents: str = '\n'.join('{} {}{};'.format(typ, prefix, i)
+                              for i, (_, typ) in enumerate(_pending_types))
+    resolved: Dict[int, ast.Symbol] = {}
     try:
-        tu: TranslationUnit = index.parse('macro_type_parser.c', unsaved_files=[
-            ('macro_type_parser.c', '{} var;'.format(' '.join(tokens_str)))
+        tu: TranslationUnit = _index().parse('macro_type_parser.c', unsaved_files=[
+            ('macro_type_parser.c', contents)
         ])
         for c in tu.cursor.get_children():
-            res = cast(ast.CompoundIdentifier, type_to_ehlit(c.type))
-            break
+            if c.kind == CursorKind.VAR_DECL and c.spelling.startswith(prefix):
+                i: int = int(c.spelling[len(prefix):])
+                resolved[id(_pending_types[i][0])] = cast(ast.CompoundIdentifier,
+                                                          type_to_ehlit(c.type))
         del tu
     except TranslationUnitLoadError:
-        print(' '.join(tokens_str))
         pass
-    del index
+    pending: Set[int] = {id(placeholder) for placeholder, _ in _pending_types}
+    _pending_types.clear()
+
+    res: List[ast.Node] = []
+    for node in nodes:
+        if isinstance(node, ast.Alias) and id(node.src_sym) in pending:
+            typ: Optional[ast.Symbol] = resolved.get(id(node.src_sym))
+            if typ is None:
+                continue
+            node.src_sym = typ
+            typ.parent = node
+        res.append(node)
     return res
 
 
@@ -0,0 +1,60 @@
+# Copyright © 2019 Cedric Legrand
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice (including the next
+# paragraph) shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import re
+from typing import Match, Optional, Pattern
+
+## @b bool Whether the comments of sources are blanked out before they are handed to the grammar.
+## Disabling it makes the grammar skip comments by itself, between each of its tokens.
+enabled: bool = True
+
+
+# Literals follow the same rules as in the grammar, so that blanking never disagrees with it on
+# where a comment starts. They are matched only to skip over them, anything else can not hold the
+# start of a comment.
+_comment_re: Pattern[str] = re.compile(
+    r'(?P<comment>//[^\n]*|/\*[\s\S]*?\*/)'
+    r'|"(?:\\"|[^"])*"'
+    r'|\'(?:\\[abefnrtv0\\]|[^\'])\''
+)
+
+_not_line_break_re: Pattern[str] = re.compile(r'[^\n]')
+
+
+def _blank(m: Match[str]) -> str:
+    comment: Optional[str] = m.group('comment')
+    if comment is None:
+        return m.group()
+    return _not_line_break_re.sub(' ', comment)
+
+
+def blank_comments(source: str) -> str:
+    """!
+    Blank out the comments of an Ehlit source.
+
+    Comments are replaced by spaces rather than removed, and keep their line breaks, so that
+    positions in the result are positions in the source file.
+    @param source @b str The contents of the source file
+    @return @b str The contents, without comments
+    """
+    if '/' not in source:
+        return source
+    return _comment_re.sub(_blank, source)
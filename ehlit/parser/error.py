@@ -20,8 +20,9 @@
 # SOFTWARE.
 
 from arpeggio import ParserPython, NoMatch, StrMatch
+from bisect import bisect_left
 from enum import IntEnum
-from typing import List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 
 excluded_tokens: Set[str] = {
@@ -29,25 +30,7 @@ excluded_tokens: Set[str] = {
     "'['",
     "'.'",
     # Builtin types are identifiers
-    'bool',
-    'int',
-    'int8',
-    'int16',
-    'int32',
-    'int64',
-    'uint',
-    'uint8',
-    'uint16',
-    'uint32',
-    'uint64',
-    'size',
-    'float',
-    'double',
-    'decimal',
-    'char',
-    'str',
-    'void',
-    'any',
+    'builtin type',
     'func',
     # Part of a type, so they belong to an identifier too
     'ref',
@@ -67,6 +50,42 @@ def handle_parse_error(err: NoMatch, parser: ParserPython) -> None:
                               'expected %s' % (' or '.join(exp)), parser.file_name)], parser)
 
 
+class SourceFile:
+    """!
+    Snapshot of the input of a parser.
+
+    Parsers are shared between parses, so a parser only knows about the last file it parsed. This
+    keeps what is needed to report failures of a given file once its parser moved to another one.
+    """
+
+    def __init__(self, parser: ParserPython) -> None:
+        """! Constructor
+        @param parser @b ParserPython The parser that just parsed the file
+        """
+        self.file_name: Optional[str] = parser.file_name
+        self.input: str = parser.input
+        ## @b int Highest number of results memoized at once while parsing the file.
+        self.peak_memo_size: int = 0
+        self._line_ends: Optional[List[int]] = None
+
+    def pos_to_linecol(self, pos: int) -> Tuple[int, int]:
+        """! Compute the line and column of a position, the same way arpeggio does
+        @param pos @b int The position in the file
+        @return @b Tuple[int, int] The line and column matching pos, both starting from 1
+        """
+        if self._line_ends is None:
+            self._line_ends = []
+            idx: int = self.input.find('\n')
+            while idx != -1:
+                self._line_ends.append(idx)
+                idx = self.input.find('\n', idx + 1)
+        line: int = bisect_left(self._line_ends, pos)
+        col: int = pos
+        if line > 0:
+            col -= self._line_ends[line - 1] + 1
+        return line + 1, col + 1
+
+
 class Failure(Exception):
     def __init__(self, severity: 'ParseError.Severity', pos: int, msg: str, file: Optional[str]
                  ) -> None:
@@ -76,6 +95,11 @@ class Failure(Exception):
         self.file: Optional[str] = file
         self.linecol: Optional[Tuple[int, int]] = None
 
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Exceptions are pickled with the arguments given to Exception.__init__, which is not called
+        # here. Failures have to be pickled to be sent back from the processes building a project.
+        return (Failure, (self.severity, self.pos, self.msg, self.file), {'linecol': self.linecol})
+
     def __str__(self) -> str:
         assert self.linecol is not None and self.file is not None
         return self.file + ':' + str(self.linecol[0]) + ':' + str(self.linecol[1]) + ': ' + self.msg
@@ -88,7 +112,8 @@ class ParseError(Exception):
         Error = 2
         Fatal = 3
 
-    def __init__(self, failures: List[Failure], parser: Optional[ParserPython] = None) -> None:
+    def __init__(self, failures: List[Failure],
+                 parser: Optional[Union[ParserPython, SourceFile]] = None) -> None:
         self.failures: List[Failure] = failures
         self.max_level: ParseError.Severity = ParseError.Severity.Unset
         self.errors: int = 0
@@ -103,6 +128,11 @@ class ParseError(Exception):
                     self.errors += 1
                 f.linecol = parser.pos_to_linecol(f.pos)
 
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # The parser is not needed anymore once line and columns of failures are known
+        state: Dict[str, Any] = dict(self.__dict__)
+        return (ParseError, (self.failures,), state)
+
     @property
     def summary(self) -> str:
         if self.warnings == 0:
@@ -20,21 +20,67 @@
 # SOFTWARE.
 
 from arpeggio import ParserPython, ParseTreeNode, visit_parse_tree, NoMatch
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Optional
 
-from ehlit.parser.ast import Statement
+from ehlit.parser import parser_cache
+from ehlit.parser.ast import Function, Statement
 from ehlit.parser.ast_builder import ASTBuilder
-from ehlit.parser.grammar import comment_grammar, function_body_grammar, Context
-from ehlit.parser.error import handle_parse_error
+from ehlit.parser.grammar import function_body_grammar
+from ehlit.parser.error import handle_parse_error, ParseError
+from ehlit.parser.parser_cache import get_parser
 
+## @b int Number of processes parsing function bodies. With more than one, the main grammar only
+## delimits function bodies, and they get parsed by parse_bodies.
+jobs: int = 1
 
-def parse(source: str, have_return_value: bool) -> List[Statement]:
-    Context.return_value = have_return_value
-    parser: ParserPython = ParserPython(function_body_grammar, comment_grammar, autokwd=True,
-                                        memoization=True)
+
+def parse(source: str) -> List[Statement]:
+    parser: ParserPython = get_parser(function_body_grammar)
     try:
         parsed: ParseTreeNode = parser.parse(source)
         body: List[Statement] = visit_parse_tree(parsed, ASTBuilder())
     except NoMatch as err:
         handle_parse_error(err, parser)
     return body
+
+
+def _parse_in_worker(source: str, cache_enabled: bool,
+                     bounded_memo: bool) -> Optional[List[Statement]]:
+    # Given with each body rather than set up once per worker, as pools only take an initializer
+    # since Python 3.7
+    parser_cache.enabled = cache_enabled
+    parser_cache.bounded_memo = bounded_memo
+    try:
+        return parse(source)
+    except ParseError:
+        # Let the function parse it again when being built, so that it reports the failures
+        return None
+
+
+def parse_bodies(functions: List[Function]) -> None:
+    """!
+    Parse the bodies of some functions in a pool of processes.
+
+    Parsed bodies are handed to their function, which builds them instead of parsing them itself.
+    Building stays sequential, as it resolves symbols through the whole AST and the order in which
+    functions are built determines predeclarations and generated variable names.
+    @param functions @b List[Function] The functions to parse the body of
+    """
+    sources: List[str] = []
+    pending: List[Function] = []
+    for fun in functions:
+        if fun.body_str is not None:
+            sources.append(fun.body_str.contents)
+            pending.append(fun)
+    if jobs <= 1 or len(pending) < 2:
+        return
+    with ProcessPoolExecutor(min(jobs, len(pending))) as pool:
+        chunksize: int = max(1, len(pending) // (jobs * 4))
+        for fun, body in zip(pending, pool.map(_parse_in_worker, sources,
+                                               repeat(parser_cache.enabled),
+                                               repeat(parser_cache.bounded_memo),
+                                               chunksize=chunksize)):
+            if body is not None:
+                fun.set_parsed_body(body)
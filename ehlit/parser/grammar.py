@@ -20,7 +20,7 @@
 # SOFTWARE.
 
 from arpeggio import RegExMatch, Optional, Sequence, ZeroOrMore, OneOrMore, Not, And, EOF
-from typing import TYPE_CHECKING
+from typing import List, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from arpeggio import GrammarType
@@ -30,10 +30,6 @@ else:
     GrammarType = int
 
 
-class Context:
-    return_value: bool = True
-
-
 # Utilities
 ###########
 
@@ -52,19 +48,33 @@ def line_comment() -> GrammarType:
     return ('//', RegExMatch(r'.*$'))
 
 
+def word_in(words: List[str], str_repr: str) -> RegExMatch:
+    """!
+    Match any word of a list as a single token.
+
+    This is equivalent to an ordered choice between each word, but tested at once instead of trying
+    each word one after the other, which matters for sets that are tried before most identifiers.
+    @param words @b List[str] The words to match
+    @param str_repr @b str How to name the set when reporting errors
+    @return @b RegExMatch A rule matching any word of the list
+    """
+    return RegExMatch(r'(?:%s)\b' % '|'.join(words), str_repr=str_repr)
+
+
 # Values
 ########
 
 def builtin_keyword() -> GrammarType:
-    return ['null', 'ref', 'if', 'elif', 'else', 'while', 'do', 'for', 'return', 'func', 'alias',
-            'switch', 'case', 'fallthrough', 'default', 'struct', 'union', 'const', 'restrict',
-            'volatile', 'inline', 'priv', 'namespace', 'class', 'ctor', 'dtor', 'new', 'del',
-            bool_value]
+    return word_in(['null', 'ref', 'if', 'elif', 'else', 'while', 'do', 'for', 'return', 'func',
+                    'alias', 'switch', 'case', 'fallthrough', 'default', 'struct', 'union', 'const',
+                    'restrict', 'volatile', 'inline', 'priv', 'namespace', 'class', 'ctor', 'dtor',
+                    'new', 'del', 'true', 'false'], 'keyword')
 
 
 def builtin_type() -> GrammarType:
-    return ['int', 'int8', 'int16', 'int32', 'int64', 'uint', 'uint8', 'uint16', 'uint32', 'uint64',
-            'float', 'double', 'decimal', 'char', 'str', 'bool', 'void', 'any', 'size']
+    return word_in(['int', 'int8', 'int16', 'int32', 'int64', 'uint', 'uint8', 'uint16', 'uint32',
+                    'uint64', 'float', 'double', 'decimal', 'char', 'str', 'bool', 'void', 'any',
+                    'size'], 'builtin type')
 
 
 def identifier() -> GrammarType:
@@ -275,10 +285,15 @@ def variable_assignment() -> GrammarType:
     return [referenced_value, compound_identifier], Optional(array_access), operation_assignment
 
 
+def return_value_ahead() -> GrammarType:
+    # A returned value must start on the same line than the `return` keyword, otherwise a bare
+    # `return` would swallow the next statement.
+    return Sequence(And(RegExMatch(r'(?:[ \t]|/\*.*?\*/)*[^\s/]', str_repr='return value')),
+                    skipws=False)
+
+
 def return_instruction() -> GrammarType:
-    if Context.return_value:
-        return 'return', expression
-    return 'return'
+    return 'return', Optional(return_value_ahead, expression)
 
 
 def statement() -> GrammarType:
@@ -388,6 +403,15 @@ def control_structure_body_stub() -> GrammarType:
     return Sequence(control_structure_body_stub_inner)
 
 
+# Bodies are parsed along with the rest of the file whenever possible. The stub is only used as a
+# fallback when the body cannot be parsed out of context (eg. a syntax error), in which case it is
+# parsed on its own when building the function, so that errors get reported from there.
+# Parsers deferring bodies only keep the stub, see parser_cache.get_parser, and bodies get parsed
+# later, see function.parse_bodies.
+def function_body() -> GrammarType:
+    return [control_structure_body, control_structure_body_stub]
+
+
 # Functions
 ###########
 
@@ -410,7 +434,7 @@ def function_declaration() -> GrammarType:
 
 
 def function_definition() -> GrammarType:
-    return ZeroOrMore(['priv', 'inline', 'cdecl']), function_prototype, control_structure_body_stub
+    return ZeroOrMore(['priv', 'inline', 'cdecl']), function_prototype, function_body
 
 
 def function() -> GrammarType:
@@ -468,15 +492,15 @@ def enum() -> GrammarType:
 
 def constructor() -> GrammarType:
     return (ZeroOrMore(['priv', 'inline']), 'ctor', '(', function_arguments, ')',
-            Optional(control_structure_body_stub))
+            Optional(function_body))
 
 
 def destructor() -> GrammarType:
-    return (ZeroOrMore(['priv', 'inline']), 'dtor', Optional(control_structure_body_stub))
+    return (ZeroOrMore(['priv', 'inline']), 'dtor', Optional(function_body))
 
 
 def class_method() -> GrammarType:
-    return ZeroOrMore(['priv', 'inline', 'cdecl']), function_prototype, control_structure_body_stub
+    return ZeroOrMore(['priv', 'inline', 'cdecl']), function_prototype, function_body
 
 
 def class_property() -> GrammarType:
@@ -0,0 +1,54 @@
+# Copyright © 2019 Cedric Legrand
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice (including the next
+# paragraph) shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""!
+Interfaces of import files.
+
+The interface of an import file is its unbuilt AST, as importers get it when parsing the import
+file. It is kept in the AST cache, keyed by the contents of the import file, so that importers load
+it from there instead of parsing the import file again.
+
+Nothing is written next to import files. The include directory they are in is meant to be
+distributed along with libraries, and loading a pickle coming from there could run anyone's code.
+"""
+
+from ehlit.parser import ast_cache, source
+from ehlit.parser.ast import AST
+from ehlit.parser.error import ParseError
+
+
+def write(import_file: str) -> None:
+    """! Put the interface of an import file in the AST cache, unless it is already there
+    @param import_file @b str Path of an import file that has just been written
+    """
+    if ast_cache.directory is None:
+        return
+    with open(import_file, 'r', encoding='utf-8') as f:
+        contents: str = f.read()
+    if ast_cache.contains(contents):
+        return
+    try:
+        ast: AST = source.parse_contents(import_file, contents)
+    except ParseError:
+        # Importers will report it when parsing the import file
+        return
+    ast_cache.store(contents, ast)
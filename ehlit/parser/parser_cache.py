@@ -0,0 +1,215 @@
+# Copyright © 2019 Cedric Legrand
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice (including the next
+# paragraph) shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import threading
+from arpeggio import NoMatch, Parser, ParserPython, ParseTreeNode, ParsingExpression
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from ehlit.parser.grammar import comment_grammar, GrammarType
+
+GrammarRoot = Callable[[], GrammarType]
+MemoEntry = Tuple[Optional[ParseTreeNode], int]
+ParserKey = Tuple[GrammarRoot, bool, bool, bool]
+
+## @b bool Whether compiled grammars are kept for the whole process. Disabling it makes each parse
+## build its own parser, which is only useful when debugging the grammar itself.
+enabled: bool = True
+
+## @b bool Whether parsers only memoize the rules listed in MEMOIZED_RULES, instead of all of them.
+bounded_memo: bool = False
+
+## @b Set[str] Rules memoized by bounded memo parsers. These are the ones that are tried again and
+## again at the same position when backtracking.
+MEMOIZED_RULES: Set[str] = {'value', 'expression', 'operator_sequence', 'full_type'}
+
+## @b str Once this rule matched, the parser never goes back before its end, so bounded memo
+## parsers forget about everything before that point.
+COMMIT_RULE: str = 'global_statement'
+
+## @b str Rule matching function bodies, which parsers deferring bodies reduce to STUB_RULE.
+BODY_RULE: str = 'function_body'
+
+## @b str Rule only delimiting a body, whose contents are left unparsed.
+STUB_RULE: str = 'control_structure_body_stub'
+
+
+def _rules(model: ParsingExpression) -> Iterator[ParsingExpression]:
+    seen: Set[int] = set()
+    stack: List[ParsingExpression] = [model]
+    while len(stack) != 0:
+        rule: ParsingExpression = stack.pop()
+        if id(rule) in seen:
+            continue
+        seen.add(id(rule))
+        yield rule
+        stack.extend(rule.nodes)
+
+
+class BoundedMemoParser(ParserPython):
+    """!
+    A parser with bounded memoization.
+
+    Full memoization keeps the result of every rule at every position until the end of the parse,
+    which takes a lot of memory on big sources. This one only memoizes the rules that are worth it,
+    and drops the results that are behind a committed top-level statement.
+    """
+
+    def __init__(self, root: GrammarRoot, comments: Optional[GrammarRoot]) -> None:
+        """! Constructor
+        @param root @b GrammarRoot The root rule of the grammar
+        @param comments @b Optional[GrammarRoot] The rule matching comments, if any
+        """
+        super().__init__(root, comments, autokwd=True, memoization=False)
+        self._caches: List[Dict[int, MemoEntry]] = []
+        ## @b int Number of results currently memoized.
+        self.memo_size: int = 0
+        ## @b int Highest number of results memoized at once during the last parse.
+        self.peak_memo_size: int = 0
+        for rule in _rules(self.parser_model):
+            if rule.rule_name in MEMOIZED_RULES:
+                self._memoize(rule)
+            elif rule.rule_name == COMMIT_RULE:
+                self._commit_on(rule)
+
+    def _memoize(self, rule: ParsingExpression) -> None:
+        cache: Dict[int, MemoEntry] = {}
+        self._caches.append(cache)
+        parse: Callable[[Parser], Optional[ParseTreeNode]] = rule.parse
+
+        def memoized_parse(parser: Parser) -> Optional[ParseTreeNode]:
+            c_pos: int = parser.position
+            try:
+                result, new_pos = cache[c_pos]
+            except KeyError:
+                try:
+                    result = parse(parser)
+                except NoMatch:
+                    self._store(cache, c_pos, (None, -1))
+                    raise
+                self._store(cache, c_pos, (result, parser.position))
+                return result
+            if new_pos == -1:
+                raise parser.nm
+            parser.position = new_pos
+            return result
+        rule.parse = memoized_parse
+
+    def _commit_on(self, rule: ParsingExpression) -> None:
+        parse: Callable[[Parser], Optional[ParseTreeNode]] = rule.parse
+
+        def committing_parse(parser: Parser) -> Optional[ParseTreeNode]:
+            result: Optional[ParseTreeNode] = parse(parser)
+            self._evict_before(parser.position)
+            return result
+        rule.parse = committing_parse
+
+    def _store(self, cache: Dict[int, MemoEntry], pos: int, entry: MemoEntry) -> None:
+        cache[pos] = entry
+        self.memo_size += 1
+        if self.memo_size > self.peak_memo_size:
+            self.peak_memo_size = self.memo_size
+
+    def _evict_before(self, pos: int) -> None:
+        for cache in self._caches:
+            for key in [k for k in cache if k < pos]:
+                del cache[key]
+        self.memo_size = sum(len(c) for c in self._caches)
+
+    def parse(self, text: str, file_name: Optional[str] = None) -> ParseTreeNode:
+        self.peak_memo_size = 0
+        try:
+            return super().parse(text, file_name)
+        finally:
+            for cache in self._caches:
+                cache.clear()
+            self.memo_size = 0
+
+
+# Parsers hold the state of the parse in progress, so each thread gets its own ones.
+_local: threading.local = threading.local()
+
+
+def _parsers() -> Dict[ParserKey, ParserPython]:
+    try:
+        return _local.parsers
+    except AttributeError:
+        _local.parsers = {}
+        return _local.parsers
+
+
+def _make_parser(root: GrammarRoot, comments: bool, deferred_bodies: bool) -> ParserPython:
+    parser: ParserPython
+    if bounded_memo:
+        parser = BoundedMemoParser(root, comment_grammar if comments else None)
+    else:
+        parser = ParserPython(root, comment_grammar if comments else None, autokwd=True,
+                              memoization=True)
+    if deferred_bodies:
+        for rule in _rules(parser.parser_model):
+            if rule.rule_name == BODY_RULE:
+                rule.nodes = [n for n in rule.nodes if n.rule_name == STUB_RULE]
+    return parser
+
+
+def get_parser(root: GrammarRoot, comments: bool = True,
+               deferred_bodies: bool = False) -> ParserPython:
+    """!
+    Get a parser for a root grammar.
+
+    Building a parser walks the whole rule graph, so it is only done once per root grammar and
+    thread. Arpeggio resets most of the parse state by itself when starting a parse and clears its
+    memoization caches at the end, only what it leaves behind is reset here.
+    @param root @b GrammarRoot The root rule of the grammar
+    @param comments @b bool Whether the parser has to skip comments, False when the input comes
+        has its comments blanked out
+    @param deferred_bodies @b bool Whether function bodies are only delimited, to be parsed on
+        their own later
+    @return @b ParserPython A parser ready to parse an input
+    """
+    if not enabled:
+        return _make_parser(root, comments, deferred_bodies)
+    parsers: Dict[ParserKey, ParserPython] = _parsers()
+    key: ParserKey = (root, comments, bounded_memo, deferred_bodies)
+    parser: ParserPython
+    try:
+        parser = parsers[key]
+    except KeyError:
+        parser = _make_parser(root, comments, deferred_bodies)
+        parsers[key] = parser
+    # Matched comments are accumulated across parses, and we never use them
+    parser.comments = []
+    return parser
+
+
+def peak_memo_size(parser: ParserPython) -> int:
+    """! Get the highest number of results a parser memoized at once during its last parse
+    @param parser @b ParserPython A parser obtained from get_parser
+    @return @b int The peak size of the memoization tables of the parser
+    """
+    if isinstance(parser, BoundedMemoParser):
+        return parser.peak_memo_size
+    # Full memoization stores a result for each miss, and never drops any before the end
+    return parser.cache_misses
+
+
+def clear() -> None:
+    """! Drop all parsers cached by the current thread """
+    _parsers().clear()
@@ -20,19 +20,38 @@
 # SOFTWARE.
 
 from arpeggio import ParserPython, ParseTreeNode, visit_parse_tree, NoMatch
+from typing import Optional
 
+from ehlit.parser import ast_cache, comments
 from ehlit.parser.ast import AST
-from ehlit.parser.grammar import comment_grammar, grammar
+from ehlit.parser.grammar import grammar
 from ehlit.parser.ast_builder import ASTBuilder
-from ehlit.parser.error import handle_parse_error
+from ehlit.parser.error import handle_parse_error, SourceFile
+from ehlit.parser.parser_cache import get_parser, peak_memo_size
 
 
-def parse(source: str) -> AST:
-    parser: ParserPython = ParserPython(grammar, comment_grammar, autokwd=True, memoization=True)
+def parse(source: str, deferred_bodies: bool = False) -> AST:
+    with open(source, 'r', encoding='utf-8') as f:
+        contents: str = f.read()
+    ast: Optional[AST] = ast_cache.load(source, contents, deferred_bodies)
+    if ast is None:
+        ast = parse_contents(source, contents, deferred_bodies)
+        ast_cache.store(contents, ast, deferred_bodies)
+    return ast
+
+
+def parse_contents(source: str, contents: str, deferred_bodies: bool = False) -> AST:
+    parser: ParserPython = get_parser(grammar, comments=not comments.enabled,
+                                      deferred_bodies=deferred_bodies)
     try:
-        parsed: ParseTreeNode = parser.parse_file(source)
+        parsed: ParseTreeNode
+        if comments.enabled:
+            parsed = parser.parse(comments.blank_comments(contents), file_name=source)
+        else:
+            parsed = parser.parse(contents, file_name=source)
         ast: AST = visit_parse_tree(parsed, ASTBuilder())
-        ast.parser = parser
+        ast.source_file = SourceFile(parser)
+        ast.source_file.peak_memo_size = peak_memo_size(parser)
     except NoMatch as err:
         handle_parse_error(err, parser)
     return ast
@@ -0,0 +1,360 @@
+# Copyright © 2019 Cedric Legrand
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice (including the next
+# paragraph) shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""!
+Build of several sources at once.
+
+Sources are built in the order of their imports, so that importers find the import files of the
+sources they import. Sources which do not depend on each other are built concurrently by a pool of
+processes, each of them keeping its parsers and caches from one source to the next.
+
+The outcome of each build is kept in a build state file, so that the next build only rebuilds the
+sources that changed, and the sources importing a source whose import file changed. Changes that
+do not show in the import file, such as the body of a function, do not rebuild the importers.
+Changes to the files a source imports from outside the project, or to the C headers it includes,
+rebuild it too.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from copy import copy
+from os import fdopen, getcwd, makedirs, path, replace, walk
+from tempfile import mkstemp
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ehlit.options import default_header, default_outputs, OptionsStruct
+from ehlit.parser.error import ParseError
+
+_import_re = re.compile(r'^[ \t]*import[ \t]+([^/ \n\t\r\f\v]+)', re.MULTILINE)
+
+
+class Unit:
+    """! A source of a project, with the sources of the project it imports. """
+
+    def __init__(self, source: str) -> None:
+        """! Constructor
+        @param source @b str Path of the source
+        """
+        ## @b str Path of the source.
+        self.source: str = source
+        ## @b Set[str] Sources of the project imported by this one.
+        self.imports: Set[str] = set()
+        ## @b Set[str] Sources of the project importing this one.
+        self.importers: Set[str] = set()
+
+
+def collect_sources(paths: List[str]) -> List[str]:
+    """! List the sources to build
+    @param paths @b List[str] Sources and directories given on the command line. Directories are
+        searched recursively for sources.
+    @return @b List[str] The sources, in a stable order
+    """
+    res: List[str] = []
+    for p in paths:
+        if not path.isdir(p):
+            res.append(path.normpath(p))
+            continue
+        for root, dirs, files in walk(p):
+            dirs.sort()
+            res.extend(path.normpath(path.join(root, f)) for f in sorted(files)
+                       if f.endswith('.eh'))
+    return list(dict.fromkeys(res))
+
+
+def find_imports(source: str) -> List[str]:
+    """! Find the libraries imported by a source, without parsing it
+    @param source @b str Path of the source
+    @return @b List[str] The imported libraries, as paths without extension
+    """
+    from ehlit.parser import comments
+    with open(source, 'r', encoding='utf-8') as f:
+        contents: str = f.read()
+    return [m.replace('.', '/') for m in _import_re.findall(comments.blank_comments(contents))]
+
+
+def dependency_graph(sources: List[str]) -> Dict[str, Unit]:
+    """! Find which sources of a project import which
+    Imports are looked up the same way the compiler does, from the directory of the importing
+    source, and then from the current directory.
+    @param sources @b List[str] The sources of the project
+    @return @b Dict[str, Unit] The units of the project, by source
+    """
+    units: Dict[str, Unit] = {src: Unit(src) for src in sources}
+    by_path: Dict[str, str] = {path.abspath(src): src for src in sources}
+    for unit in units.values():
+        for lib in find_imports(unit.source):
+            for p in (path.dirname(unit.source), getcwd()):
+                full_path: str = path.abspath(path.join(p, lib))
+                if path.isdir(full_path):
+                    prefix: str = full_path + path.sep
+                    unit.imports.update(src for abs_src, src in by_path.items()
+                                        if abs_src.startswith(prefix))
+                    break
+                if path.isfile(full_path + '.eh'):
+                    if full_path + '.eh' in by_path:
+                        unit.imports.add(by_path[full_path + '.eh'])
+                    break
+        unit.imports.discard(unit.source)
+        for imported in unit.imports:
+            units[imported].importers.add(unit.source)
+    return units
+
+
+def _hash_file(file_path: str) -> Optional[str]:
+    try:
+        with open(file_path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class BuildState:
+    """!
+    Outcome of the previous builds of the sources of a project.
+
+    For each source, it records the fingerprint of its contents and of its import file, the
+    fingerprints of the import files of the sources it imports and of every other file its build
+    depends on, such as imported files outside the project and included C headers, as of its last
+    build, how long that build took, how many of its outputs it left untouched as they did not
+    change, and whether it wrote a C header.
+    """
+
+    def __init__(self, file_path: Optional[str], headers: bool = False) -> None:
+        """! Constructor
+        @param file_path @b Optional[str] File where the state is kept, None to always rebuild
+        @param headers @b bool Whether the sources are built with C headers
+        """
+        from ehlit.parser.ast_cache import compiler_version
+        ## @b Optional[str] File where the state is kept.
+        self.file_path: Optional[str] = file_path
+        ## @b bool Whether the sources are built with C headers, their C files differ otherwise.
+        self.headers: bool = headers
+        ## @b str Fingerprint of the compiler, a state from another compiler is discarded.
+        self.compiler: str = compiler_version()
+        ## @b Dict[str, Dict[str, Any]] Outcome of the last build of each source.
+        self.units: Dict[str, Dict[str, Any]] = {}
+        if file_path is None:
+            return
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data: Any = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('compiler') == self.compiler:
+            self.units = data.get('units', {})
+
+    def fingerprint(self, source: str) -> Optional[str]:
+        """! Get the fingerprint of the import file of a source, as it is now on disk
+        @param source @b str Path of the source
+        @return @b Optional[str] The fingerprint, or None if the source has no import file yet
+        """
+        return _hash_file(default_outputs(source)[1])
+
+    def is_up_to_date(self, unit: Unit) -> bool:
+        """! Check whether a source needs to be built again
+        It must be called once the sources it imports are built, as it looks at their import files.
+        @param unit @b Unit The source to check
+        @return @b bool True if the outputs of the last build of the source are still valid
+        """
+        entry: Optional[Dict[str, Any]] = self.units.get(unit.source)
+        if entry is None or not entry['succeeded']:
+            return False
+        output_file, output_import_file = default_outputs(unit.source)
+        if not path.isfile(output_file) or entry['interface'] != _hash_file(output_import_file):
+            return False
+        if entry.get('headers', False) != self.headers or (
+                self.headers and not path.isfile(default_header(unit.source))):
+            return False
+        if entry['source'] != _hash_file(unit.source):
+            return False
+        # States written before the dependencies were recorded have none, rebuild to get them
+        dependencies: Optional[Dict[str, Optional[str]]] = entry.get('dependencies')
+        if dependencies is None or any(_hash_file(dep) != fingerprint
+                                       for dep, fingerprint in dependencies.items()):
+            return False
+        return entry['imports'] == {src: self.fingerprint(src) for src in unit.imports}
+
+    def record(self, unit: Unit, succeeded: bool, duration: float, untouched: int,
+               dependencies: List[str]) -> None:
+        """! Record the outcome of the build of a source
+        @param unit @b Unit The source that has been built
+        @param succeeded @b bool Whether it has been built without any warning or error
+        @param duration @b float How long its build took, in seconds
+        @param untouched @b int Number of its outputs left untouched, as they did not change
+        @param dependencies @b List[str] Files its build depends on, besides its source
+        """
+        # The sources of the project it imports are already covered by their import files, which
+        # only change along with their declarations
+        imported: Set[str] = {path.abspath(src) for src in unit.imports}
+        self.units[unit.source] = {
+            'source': _hash_file(unit.source),
+            'interface': self.fingerprint(unit.source),
+            'imports': {src: self.fingerprint(src) for src in unit.imports},
+            'dependencies': {dep: _hash_file(dep) for dep in dependencies
+                             if path.abspath(dep) not in imported},
+            'succeeded': succeeded,
+            'duration': round(duration, 3),
+            'untouched': untouched,
+            'headers': self.headers,
+        }
+
+    def save(self) -> None:
+        """! Write the state to its file, if any """
+        if self.file_path is None:
+            return
+        directory: str = path.dirname(self.file_path) or '.'
+        makedirs(directory, exist_ok=True)
+        # Write to a temporary file first, so that an interrupted build never leaves a broken state
+        fd, tmp = mkstemp(dir=directory, suffix='.tmp')
+        with fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'compiler': self.compiler, 'units': self.units}, f, indent=1,
+                      sort_keys=True)
+        replace(tmp, self.file_path)
+
+
+UnitResult = Tuple[Optional[ParseError], float, int, List[str]]
+
+
+def _build_unit(args: OptionsStruct, source: str) -> UnitResult:
+    from ehlit import build
+    from ehlit.parser import ast
+    from ehlit.writer import emitter
+    unit_args: OptionsStruct = copy(args)
+    unit_args.source = source
+    # The pool already uses all the jobs, do not start another one for each source
+    unit_args.jobs = 1
+    start: float = time.perf_counter()
+    err: Optional[ParseError] = None
+    try:
+        build(unit_args)
+    except ParseError as failure:
+        err = failure
+    return err, time.perf_counter() - start, emitter.untouched, sorted(ast.dependencies)
+
+
+def _submit(pool: Optional[Executor], args: OptionsStruct, source: str) -> 'Future[UnitResult]':
+    if pool is not None:
+        return pool.submit(_build_unit, args, source)
+    # Building with a single job, no need for another process
+    future: Future[UnitResult] = Future()
+    try:
+        future.set_result(_build_unit(args, source))
+    except BaseException as err:
+        future.set_exception(err)
+    return future
+
+
+class ProjectResult:
+    """! Outcome of the build of a project """
+
+    def __init__(self) -> None:
+        ## @b Dict[str, ParseError] Failures of the sources which did not build cleanly, by source.
+        self.failures: Dict[str, ParseError] = {}
+        ## @b List[str] Sources which were not built, because a source they import failed.
+        self.skipped: List[str] = []
+        ## @b List[str] Sources which were not built, because their last build is still valid.
+        self.up_to_date: List[str] = []
+        ## @b int Number of outputs of the built sources left untouched, as they did not change.
+        self.untouched: int = 0
+
+    @property
+    def succeeded(self) -> bool:
+        """! @c property @b bool Whether all sources have been built, possibly with warnings """
+        return len(self.skipped) == 0 and all(err.max_level <= ParseError.Severity.Warning
+                                              for err in self.failures.values())
+
+
+def build_project(args: OptionsStruct) -> ProjectResult:
+    """!
+    Build several sources.
+
+    Each source is built once all the sources it imports have been built successfully. Sources
+    importing a source which failed to build are not built. Sources which did not change since
+    the last build, and whose imports still have the same import files, are not built either.
+    @param args @b OptionsStruct Options of the build, with the sources or directories to build in
+        sources, and the file keeping the outcome of the previous builds in build_state
+    @return @b ProjectResult Failures of the sources which did not build cleanly
+    """
+    units: Dict[str, Unit] = dependency_graph(collect_sources(args.sources))
+    result: ProjectResult = ProjectResult()
+    waiting: Dict[str, int] = {src: len(unit.imports) for src, unit in units.items()}
+    failed: Set[str] = set()
+    running: Dict['Future[UnitResult]', str] = {}
+    state: BuildState = BuildState(args.build_state, args.headers)
+
+    pool: Optional[Executor] = ProcessPoolExecutor(args.jobs) if args.jobs > 1 else None
+    try:
+        while len(waiting) != 0 or len(running) != 0:
+            ready: List[str] = [src for src, cnt in waiting.items() if cnt == 0]
+            if len(ready) == 0 and len(running) == 0:
+                # Import cycle: imported sources get parsed by their importers anyway, so the order
+                # does not really matter
+                ready = [min(waiting)]
+                logging.warning('%s: import cycle, building it before the sources it imports',
+                                ready[0])
+            for src in ready:
+                del waiting[src]
+                if len(units[src].imports & failed) != 0:
+                    result.skipped.append(src)
+                    failed.add(src)
+                    _release(units[src], waiting)
+                    continue
+                if state.is_up_to_date(units[src]):
+                    logging.debug('%s is up to date', src)
+                    result.up_to_date.append(src)
+                    _release(units[src], waiting)
+                    continue
+                logging.debug('building %s', src)
+                running[_submit(pool, args, src)] = src
+            if len(running) == 0:
+                continue
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                src = running.pop(future)
+                err: Optional[ParseError]
+                duration: float
+                untouched: int
+                dependencies: List[str]
+                err, duration, untouched, dependencies = future.result()
+                state.record(units[src], err is None, duration, untouched, dependencies)
+                result.untouched += untouched
+                if err is not None:
+                    result.failures[src] = err
+                    if err.max_level > ParseError.Severity.Warning:
+                        failed.add(src)
+                _release(units[src], waiting)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        state.save()
+    logging.debug('%d sources up to date, %d outputs left untouched', len(result.up_to_date),
+                  result.untouched)
+    return result
+
+
+def _release(unit: Unit, waiting: Dict[str, int]) -> None:
+    for importer in unit.importers:
+        if importer in waiting:
+            waiting[importer] -= 1
@@ -0,0 +1,156 @@
+# Copyright © 2019 Cedric Legrand
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice (including the next
+# paragraph) shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""!
+Compile server.
+
+Before reading any source, the compiler discovers the C toolchain and builds its parsers, which
+often takes longer than the build itself. The server does it once, and then builds what clients
+ask for over a Unix socket, see ehlit.client. Requests are served one at a time, each one from the
+working directory of its client.
+"""
+
+import errno
+import json
+import logging
+import socket
+import socketserver
+import sys
+import traceback
+from argparse import ArgumentParser
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from os import chdir, getcwd, path, unlink
+from socketserver import StreamRequestHandler
+from typing import Any, Dict, List
+
+from ehlit import init_logging
+from ehlit.client import check_platform, default_socket, unix_sockets
+
+
+def warm_up() -> None:
+    """! Do the work every build starts with, so that builds do not have to """
+    from ehlit.parser import c_header
+    from ehlit.parser.grammar import grammar, function_body_grammar
+    from ehlit.parser.parser_cache import get_parser
+    get_parser(grammar, comments=True)
+    get_parser(grammar, comments=False)
+    get_parser(grammar, comments=False, deferred_bodies=True)
+    get_parser(function_body_grammar)
+    c_header.toolchain()
+
+
+def handle_request(cwd: str, argv: List[str]) -> Dict[str, Any]:
+    """! Build as the compiler would have if started with some arguments
+    @param cwd @b str Directory to build from
+    @param argv @b List[str] Arguments of the compiler
+    @return @b Dict[str, Any] The exit status of the build in status, and what it printed in
+        stdout and stderr
+    """
+    from ehlit import options, run
+    out: StringIO = StringIO()
+    err: StringIO = StringIO()
+    handler: logging.Handler = logging.StreamHandler(err)
+    handler.setFormatter(logging.Formatter('%(levelname)s%(message)s'))
+    logger: logging.Logger = logging.getLogger()
+    level: int = logger.level
+    # What the build logs goes to the client only
+    handlers: List[logging.Handler] = logger.handlers
+    logger.handlers = [handler]
+    status: int = 0
+    prev_cwd: str = getcwd()
+    try:
+        with redirect_stdout(out), redirect_stderr(err):
+            try:
+                chdir(cwd)
+                opts: options.OptionsStruct = options.parse_arguments(argv)
+                logger.setLevel(logging.DEBUG if opts.verbose else logging.INFO)
+                if not run(opts):
+                    status = 255
+            except SystemExit as stop:
+                # Invalid arguments, or asking for help
+                status = stop.code if isinstance(stop.code, int) else int(stop.code is not None)
+            except Exception:
+                # Keep serving other requests after a compiler bug
+                traceback.print_exc()
+                status = 255
+    finally:
+        logger.handlers = handlers
+        logger.setLevel(level)
+        chdir(prev_cwd)
+    return {'status': status, 'stdout': out.getvalue(), 'stderr': err.getvalue()}
+
+
+class BuildHandler(StreamRequestHandler):
+    """! Serve a build request sent by ehlit.client.build """
+
+    def handle(self) -> None:
+        request: Dict[str, Any] = json.loads(self.rfile.readline().decode())
+        reply: Dict[str, Any] = handle_request(request['cwd'], request['argv'])
+        self.wfile.write(json.dumps(reply).encode())
+
+
+def make_server(socket_path: str) -> 'socketserver.UnixStreamServer':
+    """! Create a compile server, ready to serve
+    @param socket_path @b str Path of the Unix socket to listen on
+    @return @b UnixStreamServer The server, listening on the socket
+    @throw OSError If the platform has no Unix sockets, or another server listens on the socket
+    """
+    check_platform()
+    if path.exists(socket_path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(socket_path)
+            except OSError:
+                # Left behind by a server which did not exit cleanly
+                unlink(socket_path)
+            else:
+                raise OSError(errno.EADDRINUSE, 'a compile server is already listening',
+                              socket_path)
+    warm_up()
+    return socketserver.UnixStreamServer(socket_path, BuildHandler)
+
+
+def serve(socket_path: str) -> None:
+    """! Serve build requests until interrupted
+    @param socket_path @b str Path of the Unix socket to listen on
+    """
+    with make_server(socket_path) as server:
+        try:
+            server.serve_forever()
+        finally:
+            unlink(socket_path)
+
+
+if __name__ == '__main__':
+    if not unix_sockets:
+        sys.exit('the compile server needs Unix sockets, which this platform does not have')
+    parser: ArgumentParser = ArgumentParser(description="Serve builds to ehlit.client")
+    parser.add_argument('--socket', default=default_socket(),
+                        help="Unix socket to listen on [default: $EHLIT_SOCKET, or "
+                        "ehlit-<uid>.sock in the temporary directory]")
+    args = parser.parse_args()
+    init_logging()
+    logging.basicConfig(format='%(levelname)s%(message)s', level=logging.INFO)
+    try:
+        serve(args.socket)
+    except KeyboardInterrupt:
+        pass
@@ -19,6 +19,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from ehlit.writer.header import HeaderWriter
 from ehlit.writer.import_file import ImportWriter
 from ehlit.writer.source import SourceWriter
 from ehlit.writer.dump import DumpWriter
@@ -34,3 +35,7 @@ class WriteSource(SourceWriter):
 
 class WriteImport(ImportWriter):
     pass
+
+
+class WriteHeader(HeaderWriter):
+    pass
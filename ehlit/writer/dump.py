@@ -32,6 +32,7 @@ from ehlit.parser.ast import (
     SwitchCaseBody, SwitchCaseTest, Symbol, TemplatedIdentifier, VariableAssignment,
     VariableDeclaration
 )
+from ehlit.writer.visitor import Visitor
 
 IndentedFnType = Callable[['DumpWriter', Union[Node, str]], None]
 
@@ -44,7 +45,9 @@ def indent(fn: IndentedFnType) -> Callable[..., None]:
     return fn_wrapper
 
 
-class DumpWriter:
+class DumpWriter(Visitor):
+    handler_prefix: str = 'dump'
+
     def __init__(self, ast: AST) -> None:
         self.prefix: str = ''
         logging.debug('')
@@ -81,8 +84,7 @@ class DumpWriter:
         self.upd_prefix = True
 
     def print_node(self, node: Node, is_next: bool = True) -> None:
-        func = getattr(self, 'dump' + type(node).__name__)
-        func(node, is_next)
+        self.handlers[type(node)](self, node, is_next)
 
     def print_node_list(self, string: str, lst: Sequence[Node], is_next: bool = True) -> None:
         self.increment_prefix(is_next)
@@ -138,13 +140,13 @@ class DumpWriter:
 
     def dump_function(self, cls_name: str, fun: Function) -> None:
         self.dump(cls_name)
-        if fun.body_str is None:
+        if not fun.has_body:
             self.print_str('Declaration')
         if fun.sym is not None:
             self.print_node(fun.sym)
         self.dump_qualifiers(fun)
-        self.print_node(fun.typ, fun.body_str is not None)
-        if fun.body_str is not None:
+        self.print_node(fun.typ, fun.has_body)
+        if fun.has_body:
             self.print_node_list('Body', fun.body, False)
 
     @indent
@@ -0,0 +1,202 @@
+# Copyright © 2019 Cedric Legrand
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice (including the next
+# paragraph) shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""!
+Buffered output of the writers.
+
+Writers produce their output one token at a time. Writing each of them to a file would make as many
+calls to the file object, so they are gathered in memory, and written in large chunks.
+
+An output can also be spooled to a temporary file, and only written once complete. Text can then be
+inserted at positions marked while writing, such as declarations which can only be written once the
+rest of the source is built.
+
+Output files are only replaced when their contents change, so that build systems looking at their
+modification times do not rebuild what depends on them for nothing.
+"""
+
+import filecmp
+import os
+import sys
+from tempfile import mkstemp, TemporaryFile
+from typing import BinaryIO, Callable, List, Optional, Sequence, TextIO, Tuple
+
+## @b int Number of output files written since the last reset.
+written: int = 0
+## @b int Number of output files left untouched since the last reset, as they did not change.
+untouched: int = 0
+
+# Temporary files are only readable by their owner, outputs get the usual permissions instead
+_umask: int = os.umask(0)
+os.umask(_umask)
+
+## @b List[str] Indentation strings of the most common levels, to avoid building them again.
+_indents: List[str] = ['    ' * i for i in range(16)]
+
+
+def indentation(level: int) -> str:
+    """! Get the indentation string of a level
+    @param level @b int The indentation level
+    @return @b str The indentation, 4 spaces per level
+    """
+    if level < len(_indents):
+        return _indents[level]
+    return '    ' * level
+
+
+class Emitter:
+    """!
+    Output of a writer.
+
+    Writers call write for each fragment of their output, and flush whenever they are done with a
+    top-level declaration. The fragments are only written to the output once they are numerous
+    enough, which takes a few large writes instead of one per fragment.
+    """
+
+    def __init__(self, f: Optional[str], chunk: int = 8192, spooled: bool = False) -> None:
+        """! Constructor
+        @param f @b Optional[str] Path of the output file, '-' for the standard output, or None to
+            keep the output in memory, see close
+        @param chunk @b int Number of fragments gathered before they are written to the output
+        @param spooled @b bool Whether the output is kept in a temporary file until close, so that
+            text can be inserted at marked positions, or the output discarded
+        """
+        ## @b Optional[str] Path of the output file, '-' for the standard output, None for memory.
+        self.output: Optional[str] = f
+        ## @b Optional[BinaryIO] Temporary file holding a spooled output, until it is closed.
+        self.spool: Optional[BinaryIO] = TemporaryFile() if spooled else None
+        ## @b Optional[str] Temporary file replacing the output file once complete, if it changed.
+        self.tmp: Optional[str] = None
+        ## @b Optional[bool] Whether the output file has been replaced, once closed. None for other
+        ## outputs.
+        self.changed: Optional[bool] = None
+        ## @b Optional[TextIO] Where the fragments are written, None to keep them in memory.
+        self.target: Optional[TextIO] = None if spooled else self._open()
+        ## @b int Number of fragments gathered before they are written to the output.
+        self.chunk: int = chunk
+        ## @b List[str] Fragments not written yet.
+        self.parts: List[str] = []
+        ## @b Callable[[str], None] Add a fragment to the output. Bound once, as it is called for
+        ## each fragment.
+        self.write: Callable[[str], None] = self.parts.append
+
+    def _open(self) -> Optional[TextIO]:
+        if self.output is None:
+            return None
+        if self.output == '-':
+            return sys.stdout
+        fd, self.tmp = mkstemp(dir=os.path.dirname(self.output) or '.', suffix='.tmp')
+        os.chmod(self.tmp, 0o666 & ~_umask)
+        return os.fdopen(fd, 'w')
+
+    def _write_parts(self) -> None:
+        contents: str = ''.join(self.parts)
+        self.parts.clear()
+        if self.spool is not None:
+            self.spool.write(contents.encode())
+        elif self.target is not None:
+            self.target.write(contents)
+
+    def flush(self) -> None:
+        """! Write the gathered fragments to the output, if there are enough of them """
+        if (self.target is not None or self.spool is not None) and len(self.parts) >= self.chunk:
+            self._write_parts()
+
+    def mark(self) -> int:
+        """! Mark the current position of a spooled output
+        @return @b int The position, to insert some text there when closing the output
+        """
+        assert self.spool is not None
+        self._write_parts()
+        return self.spool.tell()
+
+    def close(self, inserts: Sequence[Tuple[int, str]] = ()) -> Optional[str]:
+        """! Write all the remaining fragments to the output
+        @param inserts @b Sequence[Tuple[int, str]] Text to insert into a spooled output, at
+            positions given by mark, in increasing order
+        @return @b Optional[str] The whole output, if it is kept in memory, None otherwise
+        """
+        if self.spool is None:
+            contents: str = ''.join(self.parts)
+            self.parts.clear()
+            if self.target is None:
+                return contents
+            self.target.write(contents)
+            self._close_target()
+            return None
+
+        self._write_parts()
+        spool: BinaryIO = self.spool
+        self.spool = None
+        self.target = self._open()
+        res: List[str] = []
+        emit: Callable[[str], object] = res.append if self.target is None else self.target.write
+        spool.seek(0)
+        offset: int = 0
+        for pos, text in inserts:
+            # Positions are marked between fragments, never inside an encoded character
+            emit(spool.read(pos - offset).decode())
+            emit(text)
+            offset = pos
+        emit(spool.read().decode())
+        spool.close()
+        if self.target is None:
+            return ''.join(res)
+        self._close_target()
+        return None
+
+    def discard(self) -> None:
+        """! Drop an output, without writing anything more
+        The output file is left as it was, and the temporary files are removed. What has already
+        been written to the standard output stays there.
+        """
+        self.parts.clear()
+        if self.spool is not None:
+            self.spool.close()
+            self.spool = None
+        target: Optional[TextIO] = self.target
+        self.target = None
+        if self.tmp is not None:
+            assert target is not None
+            target.close()
+            os.unlink(self.tmp)
+            self.tmp = None
+
+    def _close_target(self) -> None:
+        global written
+        global untouched
+        assert self.target is not None
+        target: TextIO = self.target
+        self.target = None
+        if self.tmp is None:
+            return
+        target.close()
+        assert self.output is not None
+        self.changed = not (os.path.isfile(self.output) and
+                            filecmp.cmp(self.tmp, self.output, shallow=False))
+        if self.changed:
+            os.replace(self.tmp, self.output)
+            written += 1
+        else:
+            os.unlink(self.tmp)
+            untouched += 1
+        self.tmp = None
@@ -0,0 +1,73 @@
+# Copyright © 2019 Cedric Legrand
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice (including the next
+# paragraph) shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import re
+from os import path
+from typing import Optional
+from ehlit.parser.ast import AST, Function, Node, Statement, VariableDeclaration
+from ehlit.writer.source import SourceWriter
+
+
+class HeaderWriter(SourceWriter):
+    """! Write the C header of a module, declaring its public symbols once for all its importers """
+
+    def __init__(self, ast: Optional[AST], f: Optional[str], source: str) -> None:
+        """! Constructor
+        @param ast @b Optional[AST] The AST to write, or None to give its nodes to write_top_level
+            one at a time, as soon as they are built, and finish with close
+        @param f @b Optional[str] Path of the output file, '-' for the standard output, or None to
+            keep the output in memory, in result
+        @param source @b str Path of the source of the module, its include guard is made from it
+        """
+        self.guard: str = 'EH_' + re.sub('[^A-Z0-9]', '_', path.splitext(source)[0].upper()) + '_H'
+        super().__init__(ast, f, headers=True)
+
+    def write_prologue(self) -> None:
+        self.file.write('#ifndef {0}\n#define {0}\n\n'.format(self.guard))
+        super().write_prologue()
+
+    def write_epilogue(self) -> None:
+        self.file.write('\n#endif /* {} */\n'.format(self.guard))
+
+    def write_top_level(self, node: Node) -> None:
+        # Everything is written the way imported symbols are
+        self.in_import += 1
+        super().write_top_level(node)
+        self.in_import -= 1
+
+    def writeFunction(self, fun: Function) -> None:
+        if fun.qualifiers.is_private:
+            return
+        super().writeFunction(fun)
+
+    def writeStatement(self, stmt: Statement) -> None:
+        decl: Node = stmt.expr
+        if not isinstance(decl, VariableDeclaration) or stmt.is_child_of(Function):
+            super().writeStatement(stmt)
+            return
+        # Global variables are defined by the C file of the module, only declare them
+        if decl.private or decl.static:
+            return
+        self.write_indent()
+        self.file.write('extern ')
+        self.writeDeclaration(decl)
+        self.file.write(';\n')
@@ -19,34 +19,56 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-import sys
-from typing import List, TextIO
+from typing import List, Optional
 from ehlit.parser.ast import (
     Alias, Array, Assignment, AST, BoolValue, Cast, ClassMethod, ClassProperty, CompoundIdentifier,
     ContainerStructure, Declaration, DecimalNumber, EhClass, EhEnum, EhUnion, Expression,
     Function, FunctionType, Identifier, Import, Include, Namespace, Node, Number, Operator,
     ReferenceToType, Return, Statement, Struct, TemplatedIdentifier, VariableDeclaration
 )
-
-
-class ImportWriter:
-    def __init__(self, ast: AST, f: str) -> None:
-        self.file: TextIO = sys.stdout if f == '-' else open(f, 'w')
+from ehlit.writer.emitter import Emitter, indentation
+from ehlit.writer.visitor import Visitor
+
+
+class ImportWriter(Visitor):
+    handler_prefix: str = 'write'
+
+    def __init__(self, ast: Optional[AST], f: Optional[str]) -> None:
+        """! Constructor
+        @param ast @b Optional[AST] The AST to write, or None to give its nodes to write_top_level
+            one at a time, as soon as they are built, and finish with close
+        @param f @b Optional[str] Path of the output file, '-' for the standard output, or None to
+            keep the output in memory, in result
+        """
+        self.file: Emitter = Emitter(f, spooled=ast is None)
+        self.result: Optional[str] = None
         self.indent: int = 0
-        for node in ast:
-            self.write(node)
-        if f != '-':
-            self.file.close()
+        if ast is not None:
+            try:
+                for node in ast:
+                    self.write_top_level(node)
+                self.close()
+            except BaseException:
+                self.discard()
+                raise
+
+    def write_top_level(self, node: Node) -> None:
+        self.write(node)
+        self.file.flush()
+
+    def close(self) -> None:
+        """! Finish the output """
+        self.result = self.file.close()
+
+    def discard(self) -> None:
+        """! Drop the output, without writing anything more """
+        self.file.discard()
 
     def write(self, node: Node) -> None:
-        func = getattr(self, 'write' + type(node).__name__)
-        func(node)
+        self.handlers[type(node)](self, node)
 
     def write_indent(self) -> None:
-        i: int = 0
-        while i < self.indent:
-            self.file.write('    ')
-            i += 1
+        self.file.write(indentation(self.indent))
 
     def writeInclude(self, node: Include) -> None:
         pass
@@ -19,9 +19,10 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-import sys
-from typing import cast, Dict, Optional, Sequence, TextIO
+from os import path
+from typing import cast, Dict, List, Optional, Sequence, Tuple
 import typing
+from ehlit.options import default_header
 from ehlit.parser.ast import (
     Alias, AnonymousArray, Array, ArrayType, ArrayAccess, Assignment, AST, BoolValue, BuiltinType,
     Cast, Char, ClassMethod, ClassProperty, ClassType, CompoundIdentifier, Condition,
@@ -33,6 +34,8 @@ from ehlit.parser.ast import (
     SuffixOperatorValue, SwitchCase, SwitchCaseBody, SwitchCaseTest, Symbol, TemplatedIdentifier,
     Type, UnionType, VariableAssignment, VariableDeclaration, Value
 )
+from ehlit.writer.emitter import Emitter, indentation
+from ehlit.writer.visitor import Visitor
 
 
 class GeneratedIdentifier(Identifier):
@@ -40,9 +43,28 @@ class GeneratedIdentifier(Identifier):
         super().__init__(0, name)
 
 
-class SourceWriter:
-    def __init__(self, ast: AST, f: str) -> None:
-        self.file: TextIO = sys.stdout if f == '-' else open(f, 'w')
+class SourceWriter(Visitor):
+    handler_prefix: str = 'write'
+
+    def __init__(self, ast: Optional[AST], f: Optional[str], headers: bool = False) -> None:
+        """! Constructor
+        @param ast @b Optional[AST] The AST to write, or None to give its nodes to write_top_level
+            one at a time, as soon as they are built, and finish with close
+        @param f @b Optional[str] Path of the output file, '-' for the standard output, or None to
+            keep the output in memory, in result
+        @param headers @b bool Whether to include the C headers of the imported modules, instead
+            of declaring their symbols
+        """
+        self.file: Emitter = Emitter(f, spooled=ast is None)
+        self.result: Optional[str] = None
+        self.headers: bool = headers
+        # Included headers are relative to the output, as this is where the C compiler looks first
+        self.directory: str = path.curdir
+        if f is not None and f != '-':
+            self.directory = path.dirname(path.abspath(f))
+        # Predeclarations of the scopes written while their declarations were not built yet, with
+        # where they go in the output, and the state of the writer there
+        self.deferred: List[Tuple[int, Scope, int, int]] = []
 
         self.indent: int = 0
         self.in_import: int = 0
@@ -75,23 +97,54 @@ class SourceWriter:
             'switch': 'switch',
         }
 
-        self.file.write('#include <stddef.h>\n#include <stdint.h>\n#include <stdlib.h>\n')
+        self.write_prologue()
+
+        if ast is not None:
+            try:
+                for node in ast:
+                    self.write_top_level(node)
+                self.close()
+            except BaseException:
+                self.discard()
+                raise
 
-        for node in ast:
-            self.write(node)
+    def write_prologue(self) -> None:
+        self.file.write('#include <stddef.h>\n#include <stdint.h>\n#include <stdlib.h>\n')
 
-        if f != '-':
-            self.file.close()
+    def write_epilogue(self) -> None:
+        pass
+
+    def write_top_level(self, node: Node) -> None:
+        self.write(node)
+        self.file.flush()
+
+    def close(self) -> None:
+        """! Finish the output, once all the nodes are built """
+        inserts: List[Tuple[int, str]] = []
+        body: Emitter = self.file
+        try:
+            for pos, scope, indent, in_import in self.deferred:
+                self.file = Emitter(None)
+                self.indent = indent
+                self.in_import = in_import
+                self.write_scope_predeclarations(scope)
+                text: Optional[str] = self.file.close()
+                assert text is not None
+                inserts.append((pos, text))
+        finally:
+            self.file = body
+        self.write_epilogue()
+        self.result = self.file.close(inserts)
+
+    def discard(self) -> None:
+        """! Drop the output, without writing anything more """
+        self.file.discard()
 
     def write(self, node: Node) -> None:
-        func = getattr(self, 'write' + type(node).__name__)
-        func(node)
+        self.handlers[type(node)](self, node)
 
     def write_indent(self) -> None:
-        i: int = 0
-        while i < self.indent:
-            self.file.write('    ')
-            i += 1
+        self.file.write(indentation(self.indent))
 
     def write_value(self, node: Value) -> None:
         decl: Optional[DeclarationBase] = node.decl
@@ -124,6 +177,14 @@ class SourceWriter:
         self.file.write('>\n')
 
     def writeImport(self, node: Import) -> None:
+        if self.headers:
+            for f in node.files:
+                header: str = path.relpath(default_header(f), self.directory)
+                self.write_indent()
+                self.file.write('#include "')
+                self.file.write(header.replace(path.sep, '/'))
+                self.file.write('"\n')
+            return
         self.in_import += 1
         for sym in node.syms:
             self.write(sym)
@@ -262,6 +323,13 @@ class SourceWriter:
         self.file.write(")")
 
     def write_predeclarations(self, node: Scope) -> None:
+        if self.file.spool is not None:
+            # The declarations may not be built yet, leave room for them until close
+            self.deferred.append((self.file.mark(), node, self.indent, self.in_import))
+            return
+        self.write_scope_predeclarations(node)
+
+    def write_scope_predeclarations(self, node: Scope) -> None:
         if len(node.predeclarations) != 0:
             self.file.write('\n')
         for decl in node.predeclarations:
@@ -318,9 +386,8 @@ class SourceWriter:
         self.file.write('\n')
 
     def needs_to_write_function_body(self, node: Function) -> bool:
-        return node.body_str is not None and (self.in_import == 0 or
-                                              (node.qualifiers.is_inline and
-                                               not node.qualifiers.is_private))
+        return node.has_body and (self.in_import == 0 or
+                                  (node.qualifiers.is_inline and not node.qualifiers.is_private))
 
     def writeStatement(self, stmt: Statement) -> None:
         self.write_indent()
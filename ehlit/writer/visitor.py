@@ -0,0 +1,69 @@
+# Copyright © 2019 Cedric Legrand
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice (including the next
+# paragraph) shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from typing import Any, Callable, Dict
+
+Handler = Callable[..., None]
+
+
+class HandlerTable(Dict[type, Handler]):
+    """! Handlers of a writer class, by node class, looked up the first time they are needed """
+
+    def __init__(self, writer: type, prefix: str) -> None:
+        """! Constructor
+        @param writer @b type The writer class
+        @param prefix @b str Prefix of the names of the handlers
+        """
+        super().__init__()
+        ## @b type The writer class.
+        self.writer: type = writer
+        ## @b str Prefix of the names of the handlers.
+        self.prefix: str = prefix
+
+    def __missing__(self, typ: type) -> Handler:
+        for base in typ.__mro__:
+            found: Any = getattr(self.writer, self.prefix + base.__name__, None)
+            if found is not None:
+                self[typ] = found
+                return found
+        raise TypeError('{}: no handler for {} nodes'.format(self.writer.__name__, typ.__name__))
+
+
+class Visitor:
+    """!
+    Base of the writers, finding the handler of each node from its class.
+
+    The handler of a node class is the method named after it, with the prefix of the writer, such
+    as writeFunction for a Function. A class without a handler of its own uses the handler of its
+    closest base class. Handlers are looked up once per writer class, and kept in its handlers
+    table, so that writers call them with self.handlers[type(node)](self, node).
+    """
+
+    ## @b str Prefix of the names of the handlers.
+    handler_prefix: str = ''
+    ## @b HandlerTable Handlers of the writer class, by node class.
+    handlers: HandlerTable
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # Each writer class has its own table, the handlers of a subclass may differ
+        cls.handlers = HandlerTable(cls, cls.handler_prefix)
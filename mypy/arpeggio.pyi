@@ -14,6 +14,10 @@ class ParseTreeNode:
 
 
 class ParsingExpression:
+    rule_name: str
+    nodes: List['ParsingExpression']
+    parse: Callable[['Parser'], typing.Optional[ParseTreeNode]]
+
     def __init__(self, *elements: TokenType, **kwargs: Union[str, bool]) -> None:
         pass
 
@@ -74,14 +78,22 @@ class And(ParsingExpression):
 
 
 class Parser:
-    def parse(self, text: str) -> ParseTreeNode:
+    input: str
+    comments: List[ParseTreeNode]
+    position: int
+    nm: NoMatch
+    cache_misses: int
+    parser_model: ParsingExpression
+
+    def parse(self, text: str, file_name: typing.Optional[str] = None) -> ParseTreeNode:
         pass
 
 
 class ParserPython(Parser):
     file_name: str
 
-    def __init__(self, fun: Callable[[], GrammarType], comments: Callable[[], GrammarType],
+    def __init__(self, fun: Callable[[], GrammarType],
+                 comments: typing.Optional[Callable[[], GrammarType]],
                  debug: bool = True, **kwargs: bool) -> None:
         pass
 
@@ -2,6 +2,8 @@ from typing import Iterator, List, Optional, Text, Tuple, Union
 
 
 class Config(object):
+    loaded: bool
+
     @classmethod
     def set_library_file(self, file: str) -> None:
         pass
@@ -209,6 +211,7 @@ class CursorKind(object):
     FRIEND_DECL: 'CursorKind'
     FUNCTION_DECL: 'CursorKind'
     FUNCTION_TEMPLATE: 'CursorKind'
+    INCLUSION_DIRECTIVE: 'CursorKind'
     LAMBDA_EXPR: 'CursorKind'
     MACRO_DEFINITION: 'CursorKind'
     NAMESPACE: 'CursorKind'
@@ -249,6 +252,9 @@ class Cursor(object):
     def get_definition(self) -> Optional['Cursor']:
         pass
 
+    def get_included_file(self) -> File:
+        pass
+
     def is_abstract_record(self) -> bool:
         pass
 
@@ -289,12 +295,20 @@ class Diagnostic(object):
         pass
 
 
+class FileInclusion(object):
+    include: File
+    depth: int
+
+
 class TranslationUnit(object):
     PARSE_DETAILED_PROCESSING_RECORD: int
 
     cursor: Cursor
     diagnostics: Iterator[Diagnostic]
 
+    def get_includes(self) -> Iterator[FileInclusion]:
+        pass
+
     @classmethod
     def from_ast_file(cls, filename: Text, index: Optional[Index]=None) -> 'TranslationUnit':
         pass
@@ -65,6 +65,15 @@ class Pipe():
 class EhlitTestCase(TestCase):
     """ Extent to unittest.TestCase to ease writing of tests for the Ehlit language """
 
+    # Directory where compiled sources are cached, tests parse everything by default
+    ast_cache_dir = None
+    # Directory where translated C headers are cached, tests parse everything by default
+    header_cache_dir = None
+    # Number of processes parsing function bodies
+    jobs = 1
+    # Whether each declaration is written as soon as it is built
+    low_memory = False
+
     def __init__(self, arg):
         super().__init__(arg)
         self.maxDiff = None
@@ -115,9 +124,20 @@ class EhlitTestCase(TestCase):
         @return dict Results of the compilation (stdout, stderr)
         """
         class opts:
+            ast_cache = self.ast_cache_dir
+            blank_comments = True
+            bounded_memo = False
+            header_cache = self.header_cache_dir
+            headers = False
+            jobs = self.jobs
+            merge_includes = True
             output_file = '-'
+            output_header_file = None
             output_import_file = None
+            parser_cache = True
+            low_memory = self.low_memory
             source = src
+            toolchain_cache = None
             verbose = False
         return self.run_compiler(opts)
 
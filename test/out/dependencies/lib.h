@@ -0,0 +1,2 @@
+#include "lib_types.h"
+
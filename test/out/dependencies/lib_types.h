@@ -0,0 +1,2 @@
+typedef int lib_t;
+
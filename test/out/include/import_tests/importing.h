@@ -0,0 +1,9 @@
+#ifndef EH_IMPORT_TESTS_IMPORTING_H
+#define EH_IMPORT_TESTS_IMPORTING_H
+
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include "source.h"
+
+#endif /* EH_IMPORT_TESTS_IMPORTING_H */
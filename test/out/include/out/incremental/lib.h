@@ -0,0 +1,9 @@
+#ifndef EH_OUT_INCREMENTAL_LIB_H
+#define EH_OUT_INCREMENTAL_LIB_H
+
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+int32_t EF3libB3int(int32_t i);
+
+#endif /* EH_OUT_INCREMENTAL_LIB_H */
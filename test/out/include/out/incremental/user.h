@@ -0,0 +1,10 @@
+#ifndef EH_OUT_INCREMENTAL_USER_H
+#define EH_OUT_INCREMENTAL_USER_H
+
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include "lib.h"
+int32_t EF4user(void);
+
+#endif /* EH_OUT_INCREMENTAL_USER_H */
@@ -0,0 +1,4 @@
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include "../../include/import_tests/source.h"
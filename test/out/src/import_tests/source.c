@@ -0,0 +1,95 @@
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+
+struct ES19forward_decl_struct;
+
+struct ES11test_struct
+{
+    int32_t i;
+    char* s;
+};
+
+union EU18forward_decl_union;
+
+union EU10test_union
+{
+    int32_t i;
+    char* s;
+};
+
+enum EN17forward_decl_enum;
+
+enum EN9test_enum
+{
+    EN9test_enum4val1,
+    EN9test_enum4val2
+};
+
+int32_t EF9fun_proto(void);
+
+int32_t EF14fun_proto_argsB3intB3str(int32_t i, char* s);
+
+int32_t EF3fun(void)
+{
+    return (5);
+}
+
+int32_t EF14fun_proto_argsB3intB3str(int32_t i, char* s)
+{
+    if (i < 5)
+    {
+        s = "bla";
+    }
+    else
+    {
+        s = "blabla";
+    }
+}
+typedef int32_t ET2nb;
+ET2nb(* EV13fun_proto_ref)() = &EF9fun_proto;
+uint8_t EV6global = !0;
+static uint8_t EV17this_var_exported = 0;
+
+ET2nb main(void)
+{
+}
+
+inline int32_t EF16inlined_functionB3intB3int(int32_t a, int32_t b)
+{
+    return (a + b);
+}
+
+static int32_t EF3mulB3intB3int(int32_t a, int32_t b)
+{
+    return (a * b);
+}
+
+inline static int32_t EF3divB3intB3int(int32_t a, int32_t b)
+{
+    return (a / b);
+}
+
+void EN3FooF15namespaced_func(void);
+int32_t EN3FooV14namespaced_var;
+
+void EN3BarN6NestedF11nested_func(void);
+
+void EN3BarN6NestedF18second_nested_func(void);
+
+struct EC1A;
+
+struct EC1B
+{
+    int32_t property;
+    char* name;
+};
+
+void EC1BIB3int(struct EC1B* this, int32_t some_arg);
+
+void EC1BD(struct EC1B* this);
+
+void EC1BF6method(struct EC1B* this)
+{
+    this->property = 42;
+}
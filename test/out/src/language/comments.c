@@ -0,0 +1,13 @@
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+
+void EF6printfB3str(char* s)
+{
+}
+
+int32_t main(int32_t ac, char** av)
+{
+    EF6printfB3str("Hello, world!\n");
+    return (0);
+}
@@ -0,0 +1,19 @@
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+
+void* EF8function(void)
+{
+    return (NULL);
+}
+
+void EF8get_nullB3any(void* p)
+{
+}
+
+int32_t main(void)
+{
+    char* s = NULL;
+    EF8get_nullB3any(NULL);
+    return (0);
+}
@@ -0,0 +1,23 @@
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+
+int32_t main(void)
+{
+    int8_t i8;
+    int16_t i16;
+    int32_t i32;
+    int64_t i64;
+    uint8_t ui8;
+    uint16_t ui16;
+    uint32_t ui32;
+    uint64_t ui64;
+    int32_t i = 42;
+    int32_t j = -42;
+    float f;
+    double d;
+    long double ld;
+    float k = 42.59;
+    float l = -42.59;
+    return (0);
+}
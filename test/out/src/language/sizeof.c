@@ -0,0 +1,11 @@
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+
+int32_t main(void)
+{
+    int32_t sz = sizeof(int32_t);
+    sz = sizeof(int32_t*);
+    sz = sizeof(int32_t*);
+    return (0);
+}
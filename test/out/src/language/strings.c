@@ -0,0 +1,10 @@
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+
+int32_t main(void)
+{
+    char* s1 = "Hardcoded string";
+    char* s2 = "It should be \"quotable\"";
+    return (0);
+}
@@ -0,0 +1,10 @@
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+int32_t EF3lib(void);
+#include <out/dependencies/lib.h>
+
+lib_t EF4user(void)
+{
+    return (EF3lib());
+}
@@ -0,0 +1,9 @@
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+
+struct ES3Lib
+{
+    int32_t value;
+    int32_t other;
+};
@@ -0,0 +1,14 @@
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+
+struct ES3Lib
+{
+    int32_t value;
+    int32_t other;
+};
+
+int32_t EF4user(void)
+{
+    return (0);
+}
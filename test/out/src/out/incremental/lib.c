@@ -0,0 +1,8 @@
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+
+int32_t EF3libB3int(int32_t i)
+{
+    return (i);
+}
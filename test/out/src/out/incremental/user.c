@@ -0,0 +1,9 @@
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include "../../../include/out/incremental/lib.h"
+
+int32_t EF4user(void)
+{
+    return (EF3libB3int(1));
+}
@@ -0,0 +1,8 @@
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+
+int32_t EF5alone(void)
+{
+    return (1);
+}
@@ -0,0 +1,99 @@
+# Copyright © 2019 Cedric Legrand
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice (including the next
+# paragraph) shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import tempfile
+from unittest import mock
+
+from test.common import EhlitTestCase
+from ehlit.parser import ast_cache, function, source
+from ehlit.parser.ast import Function
+
+
+class TestAstCache(EhlitTestCase):
+    """ Test the on-disk cache of parsed sources """
+
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        ast_cache.directory = self.ast_cache_dir = self.cache_dir.name
+
+    def tearDown(self):
+        super().tearDown()
+        ast_cache.directory = None
+        self.cache_dir.cleanup()
+
+    def test_cache_hit(self):
+        with open('language/function.eh') as f:
+            contents = f.read()
+        self.assertIsNone(ast_cache.load('language/function.eh', contents))
+        parsed = source.parse('language/function.eh')
+        self.assertEqual(len(os.listdir(self.cache_dir.name)), 1)
+        cached = ast_cache.load('language/function.eh', contents)
+        self.assertIsNotNone(cached)
+        self.assertEqual([type(n) for n in cached], [type(n) for n in parsed])
+
+    def test_cache_miss_on_change(self):
+        source.parse('language/function.eh')
+        with open('language/function.eh') as f:
+            contents = f.read()
+        self.assertIsNone(ast_cache.load('language/function.eh', contents + '\n'))
+
+    def test_cached_compiles(self):
+        for i in range(2):
+            self.assert_compiles('language/function.eh')
+            self.assert_error_file('language_error/undeclared_identifier.eh',
+                                   'language_error/undeclared_identifier.eh.err')
+        # Both sources, and the interface of the import file written for the first one
+        self.assertEqual(len(os.listdir(self.cache_dir.name)), 3)
+
+    def test_cache_per_parse_mode(self):
+        self.assert_compiles('language/function.eh')
+        # Bodies parsed along with the rest of the source may not be served to a parallel build,
+        # which would have nothing left to parse in its workers
+        self.jobs = 2
+        with mock.patch.object(Function, 'set_parsed_body', autospec=True,
+                               side_effect=Function.set_parsed_body) as parsed:
+            self.assert_compiles('language/function.eh')
+        self.assertGreater(parsed.call_count, 1)
+        # The source in both modes, and the interface of its import file
+        self.assertEqual(len(os.listdir(self.cache_dir.name)), 3)
+
+    def test_cache_low_memory(self):
+        self.assert_compiles('language/function.eh')
+        # Low memory builds only parse the body of each function when building it, a cached AST
+        # holding all the bodies would have them all in memory at once
+        self.low_memory = True
+        with mock.patch.object(function, 'parse', wraps=function.parse) as parsed:
+            self.assert_compiles('language/function.eh')
+        self.assertGreater(parsed.call_count, 1)
+
+    def test_interface_cached(self):
+        import_file = 'out/include/language/function.eh'
+        self.assert_compiles('language/function.eh')
+        # The import file has been parsed to cache its interface, importers parsing it hit it
+        with open(import_file) as f:
+            contents = f.read()
+        self.assertTrue(ast_cache.contains(contents))
+        self.assertIsNotNone(ast_cache.load(import_file, contents))
+        # Nothing is written beside the import file, its directory is meant to be distributed
+        self.assertEqual([f for f in os.listdir('out/include/language') if f.endswith('.ehi')],
+                         [])
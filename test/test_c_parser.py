@@ -19,8 +19,15 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import os
+import subprocess
+import sys
+from tempfile import mkdtemp
+
 from clang.cindex import Index
 from test.common import EhlitTestCase
+from ehlit.parser import c_header
+from ehlit.parser.ast import Alias
 
 
 class TestCParser(EhlitTestCase):
@@ -44,8 +51,77 @@ class TestCParser(EhlitTestCase):
     def test_c_macro_usage(self):
         self.assert_compiles('c_parser/macro.eh')
 
+    def test_lazy_toolchain(self):
+        proc = subprocess.run([sys.executable, '-c', 'import ehlit.parser.c_header as c; '
+                               'import ehlit.parser; print(c._toolchain)'],
+                              cwd='..', stdout=subprocess.PIPE, encoding='utf-8')
+        self.assertEqual(proc.stdout, 'None\n')
+
+    def test_toolchain_cache(self):
+        found = c_header.toolchain()
+        cache_file = os.path.join(mkdtemp(), 'toolchain.json')
+        c_header.cache_file = cache_file
+        c_header._toolchain = None
+        try:
+            self.assertEqual(c_header.toolchain().include_dirs, found.include_dirs)
+            self.assertTrue(os.path.isfile(cache_file))
+            c_header._toolchain = None
+            find_toolchain = c_header._find_toolchain
+            c_header._find_toolchain = None
+            try:
+                cached = c_header.toolchain()
+            finally:
+                c_header._find_toolchain = find_toolchain
+            self.assertEqual(cached.include_dirs, found.include_dirs)
+            self.assertEqual(cached.builtin_defines, found.builtin_defines)
+        finally:
+            c_header.cache_file = None
+            c_header._toolchain = found
+            os.remove(cache_file)
+            os.rmdir(os.path.dirname(cache_file))
+
+    def count_parses(self, fun, *args):
+        parsed = []
+        index = c_header._index()
+
+        class CountingIndex:
+            def parse(self, path, **kwargs):
+                parsed.append(path)
+                return index.parse(path, **kwargs)
+        c_header._shared_index = CountingIndex()
+        try:
+            return fun(*args), len(parsed)
+        finally:
+            c_header._shared_index = index
+
+    def test_macro_types_batch(self):
+        nodes, parses = self.count_parses(c_header.parse, 'c_parser/macro.h')
+        # The header itself, and all the types of its macros at once
+        self.assertEqual(parses, 2)
+        aliases = [n.dst.name for n in nodes if isinstance(n, Alias)]
+        self.assertIn('MACRO_TYPE_LDOUBLE', aliases)
+        self.assertIn('MACRO_TYPE_STR', aliases)
+
+    def test_merged_includes(self):
+        os.makedirs('out/c_parser', exist_ok=True)
+        with open('out/c_parser/includes.eh', 'w') as f:
+            f.write('include c_parser/struct.h\ninclude c_parser/macro.h\n'
+                    'include c_parser/function.h\n')
+        merged, parses = self.count_parses(self.dump, 'out/c_parser/includes.eh')
+        # All the headers at once, and the types of the macros of macro.h
+        self.assertEqual(parses, 2)
+        c_header.merge_includes = False
+        try:
+            separate, parses = self.count_parses(self.dump, 'out/c_parser/includes.eh')
+        finally:
+            c_header.merge_includes = True
+        self.assertEqual(parses, 4)
+        self.assertEqual(merged, separate)
+
     def _compute_sizes(self):
         self.sizes = {}
+        # Sets the Clang library up
+        c_header.toolchain()
         index = Index.create()
         tu = index.parse('test.c', unsaved_files=[
             ('test.c', '''
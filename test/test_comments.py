@@ -0,0 +1,48 @@
+# Copyright © 2019 Cedric Legrand
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice (including the next
+# paragraph) shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from test.common import EhlitTestCase
+from ehlit.parser import comments
+
+
+class TestLexer(EhlitTestCase):
+    """ Test the blanking of comments before the grammar """
+
+    def tearDown(self):
+        super().tearDown()
+        comments.enabled = True
+
+    def test_comments_blanked(self):
+        source = 'int/* a\nb */a // c\n'
+        text = comments.blank_comments(source)
+        self.assertEqual(text, 'int    \n    a     \n')
+        self.assertEqual(len(text), len(source))
+
+    def test_literals_kept(self):
+        source = 'str s = "a // b" + \'/\' // c\nchar c = \'"\' /* d */'
+        self.assertEqual(comments.blank_comments(source),
+                         'str s = "a // b" + \'/\'     \nchar c = \'"\'        ')
+
+    def test_without_blanking(self):
+        comments.enabled = False
+        self.assert_compiles('language/comments.eh')
+        self.assert_error_file('language_error/undeclared_identifier.eh',
+                               'language_error/undeclared_identifier.eh.err')
@@ -19,7 +19,15 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import os
+import shutil
+
 from test.common import EhlitTestCase
+from ehlit import build
+from ehlit.options import parse_arguments
+from ehlit.parser import parse
+from ehlit.parser.ast import Dtor, Function, Node
+from ehlit.writer import WriteDump, WriteImport, WriteSource
 
 
 class TestCompiler(EhlitTestCase):
@@ -30,3 +38,53 @@ class TestCompiler(EhlitTestCase):
 
     def test_file_no_ent(self):
         self.assert_error("doesnotexist.eh", "doesnotexist.eh: no such file or directory")
+
+    def test_in_memory_output(self):
+        class opts:
+            source = 'import_tests/source.eh'
+            output_import_file = '-'
+        ast = parse(opts.source)
+        ast.build_ast(opts)
+        with open('import_tests/source.inc.eh', 'r') as f:
+            self.assertEqual(WriteImport(ast, None).result, f.read())
+        self.assertEqual(WriteSource(ast, None).result, self.compile(opts.source).stdout)
+        self.assertIsNone(WriteImport(ast, 'out/in_memory.eh').result)
+        with open('out/in_memory.eh', 'r') as f:
+            self.assertEqual(WriteImport(ast, None).result, f.read())
+
+    def test_writer_handlers(self):
+        self.assertIs(WriteSource.handlers[Dtor], WriteSource.writeDtor)
+
+        class Inline(Function):
+            pass
+        self.assertIs(WriteImport.handlers[Inline], WriteImport.writeFunction)
+        self.assertIs(WriteDump.handlers[Inline], WriteDump.dumpFunction)
+        with self.assertRaisesRegex(TypeError, 'WriteSource: no handler for Node nodes'):
+            WriteSource.handlers[Node]
+
+    def test_failed_writer(self):
+        shutil.rmtree('out/failed', ignore_errors=True)
+        os.makedirs('out/failed')
+        with self.assertRaisesRegex(TypeError, 'WriteSource: no handler for Node nodes'):
+            WriteSource([Node()], 'out/failed/source.c')
+        with self.assertRaisesRegex(TypeError, 'WriteImport: no handler for Node nodes'):
+            WriteImport([Node()], 'out/failed/source.eh')
+        # Neither the outputs nor their temporary files are left behind
+        self.assertEqual(os.listdir('out/failed'), [])
+
+    def test_unchanged_outputs(self):
+        outputs = ['out/unchanged/function.c', 'out/unchanged/function.eh']
+        args = parse_arguments(['language/function.eh', '-o', outputs[0], '--gen-import-output',
+                                outputs[1], '--gen-no-ast-cache'])
+        build(args)
+        for f in outputs:
+            os.utime(f, ns=(1, 1))
+        build(args)
+        self.assertEqual([os.stat(f).st_mtime_ns for f in outputs], [1, 1])
+        self.assertEqual(sorted(os.listdir('out/unchanged')), ['function.c', 'function.eh'])
+
+        with open(outputs[0], 'a') as f:
+            f.write('\n')
+        build(args)
+        self.assertNotEqual(os.stat(outputs[0]).st_mtime_ns, 1)
+        self.assertEqual(os.stat(outputs[1]).st_mtime_ns, 1)
@@ -0,0 +1,66 @@
+# Copyright © 2019 Cedric Legrand
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice (including the next
+# paragraph) shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import tempfile
+
+from test.common import EhlitTestCase
+from ehlit.parser import c_header
+
+
+class TestHeaderCache(EhlitTestCase):
+    """ Test the on-disk cache of translated C headers """
+
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        c_header.cache_directory = self.header_cache_dir = self.cache_dir.name
+
+    def tearDown(self):
+        super().tearDown()
+        c_header.cache_directory = None
+        self.cache_dir.cleanup()
+
+    def entry(self, header):
+        return c_header._cache_entry([c_header.find_file_in_path(header)])
+
+    def test_cache_hit(self):
+        self.assertIsNone(c_header._load_entry(self.entry('c_parser/struct.h')))
+        parsed = c_header.parse('c_parser/struct.h')
+        self.assertEqual(len(os.listdir(self.cache_dir.name)), 1)
+        cached = c_header._load_entry(self.entry('c_parser/struct.h'))
+        self.assertIsNotNone(cached)
+        self.assertEqual([type(n) for n in cached], [type(n) for n in parsed])
+
+    def test_cache_miss_on_change(self):
+        c_header.parse('c_parser/struct.h')
+        st = os.stat('c_parser/struct.h')
+        os.utime('c_parser/struct.h', ns=(st.st_atime_ns, st.st_mtime_ns + 1000000000))
+        try:
+            self.assertIsNone(c_header._load_entry(self.entry('c_parser/struct.h')))
+        finally:
+            os.utime('c_parser/struct.h', ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    def test_cached_compiles(self):
+        for i in range(2):
+            self.assert_compiles('c_parser/function.eh')
+            self.assert_compiles('c_parser/macro.eh')
+        self.assertEqual(len(os.listdir(self.cache_dir.name)), 2)
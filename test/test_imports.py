@@ -19,7 +19,11 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+
+import os
+
 from test.common import EhlitTestCase
+from ehlit.options import parse_arguments
 from ehlit.parser import parse, ParseError
 
 
@@ -35,6 +39,35 @@ class TestImports(EhlitTestCase):
         self.assert_files_equal('import_tests/source.inc.eh',
                                 'out/include/import_tests/source.eh')
 
+    def test_header_generation(self):
+        for mode in [[], ['--gen-low-memory']]:
+            args = parse_arguments(['import_tests/source.eh', '-o', '-', '--gen-header-output',
+                                    'out/headers/source.h', '--gen-no-ast-cache'] + mode)
+            self.run_compiler(args)
+            self.assert_files_equal('import_tests/source.inc.h', 'out/headers/source.h')
+
+        # Importers include the header instead of declaring the imported symbols
+        args = parse_arguments(['import_tests/importing.eh', '-o', '-', '--gen-headers',
+                                '--gen-no-ast-cache'])
+        output = self.run_compiler(args)
+        self.assertEqual(output.stdout, '#include <stddef.h>\n#include <stdint.h>\n'
+                         '#include <stdlib.h>\n#include "out/include/import_tests/source.h"\n')
+        # Headers include each other relative to their own directory
+        with open('out/include/import_tests/importing.h', 'r') as f:
+            self.assertIn('\n#include "source.h"\n', f.read())
+
+    def test_import_source_file(self):
+        os.makedirs('out/import_source', exist_ok=True)
+        with open('out/import_source/lib.eh', 'w') as f:
+            f.write('int lib()\n{\n\treturn 1\n}\n')
+        with open('out/import_source/user.eh', 'w') as f:
+            f.write('import lib\n\nint user()\n{\n\treturn lib()\n}\n')
+        # The imported nodes are moved from the AST of the imported file to the import, whose
+        # scope their names are mangled in
+        output = self.compile('out/import_source/user.eh')
+        self.assertEqual(output.stderr, '')
+        self.assertIn('int32_t EF3lib(void);\n', output.stdout)
+
     def test_importing_file(self):
         ast = None
         failure = None
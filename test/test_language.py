@@ -20,6 +20,8 @@
 # SOFTWARE.
 
 from test.common import EhlitTestCase
+from ehlit.parser import function, parse
+from ehlit.parser.ast import ArrayType, Number, Statement, StatementList
 
 
 class TestLanguage(EhlitTestCase):
@@ -35,3 +37,45 @@ class TestLanguage(EhlitTestCase):
             with self.subTest(case=c):
                 f = '{}/{}'.format(self.test_dir, c)
                 self.assert_compiles(f)
+
+    def test_shared_builtin_types(self):
+        class opts:
+            output_import_file = '-'
+            source = 'language/array.eh'
+        ast = parse(opts.source)
+        ast.build_ast(opts)
+        int_type = ast.find_declaration('@int')[0]
+        self.assertIs(int_type, ast.find_declaration('@int')[0])
+        self.assertIs(ast, int_type.parent)
+        array = ArrayType(int_type)
+        self.assertIsNot(int_type, array.child)
+        self.assertIs(array, array.child.parent)
+        self.assertEqual(int_type, array.child)
+
+    def test_statement_list(self):
+        a, b, c, d, e = [Statement(Number(str(i))) for i in range(5)]
+        flow = StatementList([a, c])
+        flow.insert_before(b, flow.link(c))
+        flow.insert_after(e, flow.link(c))
+        flow.insert_after(d, flow.link(c))
+        self.assertEqual([a, b, c, d, e], list(flow))
+        f = Statement(Number('5'))
+        flow.set(flow.link(a), f)
+        self.assertIs(flow.link(f), flow.first)
+        self.assertEqual([f, b, c, d, e], list(flow))
+
+
+class TestLanguageParallel(TestLanguage):
+    """ Test valid language features, parsing function bodies in a pool of processes """
+
+    jobs = 2
+
+    def tearDown(self):
+        super().tearDown()
+        function.jobs = 1
+
+
+class TestLanguageLowMemory(TestLanguage):
+    """ Test valid language features, writing each declaration as soon as it is built """
+
+    low_memory = True
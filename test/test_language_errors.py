@@ -35,3 +35,9 @@ class TestLanguageErrors(EhlitTestCase):
             with self.subTest(case=c):
                 f = '{}/{}'.format(self.test_dir, c)
                 self.assert_error_file(f, f + '.err')
+
+
+class TestLanguageErrorsLowMemory(TestLanguageErrors):
+    """ Test non valid language usage, writing each declaration as soon as it is built """
+
+    low_memory = True
@@ -0,0 +1,74 @@
+# Copyright © 2019 Cedric Legrand
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice (including the next
+# paragraph) shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import tracemalloc
+
+from test.common import EhlitTestCase
+from ehlit.parser.ast import (
+    BuiltinType, CompoundIdentifier, Expression, Identifier, Number, ReferenceType, Statement
+)
+
+
+class DictIdentifier(Identifier):
+    """ Identifier keeping its attributes in a dictionary, as nodes did before using slots """
+
+
+class DictNumber(Number):
+    """ Number keeping its attributes in a dictionary, as nodes did before using slots """
+
+
+class TestMemory(EhlitTestCase):
+    """ Memory benchmark of AST nodes """
+
+    def measure(self, make, count=10000):
+        """
+        Measure the memory taken by nodes
+
+        @param make Function building a node
+        @param count Number of nodes to build
+        @return float The average size of a node, in bytes
+        """
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            nodes = [make() for _ in range(count)]
+            size = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(len(nodes), count)
+        return size / count
+
+    def test_nodes_have_no_dict(self):
+        nodes = [
+            Identifier(0, 'a'), CompoundIdentifier([Identifier(0, 'a')]), Number('1'),
+            Expression([Number('1')], False), Statement(Number('1')), BuiltinType('@int'),
+            ReferenceType(BuiltinType('@int')),
+        ]
+        for node in nodes:
+            with self.subTest(node=type(node).__name__):
+                self.assertFalse(hasattr(node, '__dict__'))
+
+    def test_node_size(self):
+        self.assertLess(self.measure(lambda: Identifier(0, 'a')),
+                        self.measure(lambda: DictIdentifier(0, 'a')))
+        self.assertLess(self.measure(lambda: Number('1')),
+                        self.measure(lambda: DictNumber('1')))
@@ -0,0 +1,75 @@
+# Copyright © 2019 Cedric Legrand
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice (including the next
+# paragraph) shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from test.common import EhlitTestCase
+from ehlit.parser import parser_cache, source
+from ehlit.parser.grammar import grammar
+
+
+class TestParserCache(EhlitTestCase):
+    """ Test the process wide parser cache """
+
+    def tearDown(self):
+        super().tearDown()
+        parser_cache.enabled = True
+        parser_cache.bounded_memo = False
+
+    def test_parser_reused(self):
+        self.assertIs(parser_cache.get_parser(grammar), parser_cache.get_parser(grammar))
+
+    def test_parser_cache_disabled(self):
+        parser_cache.enabled = False
+        self.assertIsNot(parser_cache.get_parser(grammar), parser_cache.get_parser(grammar))
+
+    def test_failures_after_reuse(self):
+        self.assert_error_file('language_error/undeclared_identifier.eh',
+                               'language_error/undeclared_identifier.eh.err')
+        self.assert_compiles('language/function.eh')
+        self.assert_error_file('language_error/undeclared_identifier.eh',
+                               'language_error/undeclared_identifier.eh.err')
+
+    def test_bounded_memo(self):
+        parser_cache.bounded_memo = True
+        parser = parser_cache.get_parser(grammar)
+        self.assertIsInstance(parser, parser_cache.BoundedMemoParser)
+        self.assert_compiles('language/function.eh')
+        self.assert_error_file('language_error/undeclared_identifier.eh',
+                               'language_error/undeclared_identifier.eh.err')
+
+    def test_bounded_memo_size(self):
+        with open('language/function.eh') as f:
+            source = f.read()
+        full = parser_cache.get_parser(grammar)
+        full.parse(source)
+        parser_cache.bounded_memo = True
+        bounded = parser_cache.get_parser(grammar)
+        bounded.parse(source)
+        self.assertGreater(parser_cache.peak_memo_size(bounded), 0)
+        self.assertLess(parser_cache.peak_memo_size(bounded), parser_cache.peak_memo_size(full))
+
+    def test_deferred_bodies(self):
+        contents = 'int f()\n{\n\treturn 1\n}\n'
+        deferred = source.parse_contents('f.eh', contents, deferred_bodies=True)
+        self.assertIsNotNone(deferred.nodes[0].body_str)
+        # Parsers deferring bodies are separate ones, others keep parsing bodies in a single pass
+        self.assertIsNot(parser_cache.get_parser(grammar, deferred_bodies=True),
+                         parser_cache.get_parser(grammar))
+        self.assertIsNone(source.parse_contents('f.eh', contents).nodes[0].body_str)
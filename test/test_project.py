@@ -0,0 +1,138 @@
+# Copyright © 2019 Cedric Legrand
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice (including the next
+# paragraph) shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import os
+from os import path
+from types import SimpleNamespace
+
+from test.common import EhlitTestCase
+from ehlit.project import build_project, collect_sources, dependency_graph
+
+
+class TestProject(EhlitTestCase):
+    """ Test the build of several sources at once """
+
+    def options(self, sources, jobs, build_state=None):
+        return SimpleNamespace(ast_cache=None, blank_comments=True, bounded_memo=False,
+                               build_state=build_state, header_cache=None, headers=False,
+                               jobs=jobs, low_memory=False, merge_includes=True, output_file=None,
+                               output_header_file=None, output_import_file=None,
+                               parser_cache=True, source='', sources=sources,
+                               toolchain_cache=None, verbose=False)
+
+    def write_source(self, source, contents):
+        os.makedirs(path.dirname(source), exist_ok=True)
+        with open(source, 'w') as f:
+            f.write(contents)
+
+    def test_collect_sources(self):
+        self.assertEqual(collect_sources(['project_tests', 'language/function.eh']), [
+            'project_tests/alone.eh', 'project_tests/broken.eh', 'project_tests/user.eh',
+            'language/function.eh',
+        ])
+
+    def test_dependency_graph(self):
+        units = dependency_graph(collect_sources(['project_tests', 'import_tests']))
+        self.assertEqual(units['project_tests/user.eh'].imports, {'project_tests/broken.eh'})
+        self.assertEqual(units['project_tests/broken.eh'].importers, {'project_tests/user.eh'})
+        self.assertEqual(units['import_tests/importing.eh'].imports, {'import_tests/source.eh'})
+        self.assertEqual(units['project_tests/alone.eh'].imports, set())
+
+    def test_build_project(self):
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                result = build_project(self.options(['language'], jobs))
+                self.assertTrue(result.succeeded)
+                self.assertEqual(result.failures, {})
+                for src in collect_sources(['language']):
+                    self.assert_files_equal('out/src/{}.c'.format(src[:-3]), src + '.c')
+
+    def test_failed_import(self):
+        result = build_project(self.options(['project_tests'], 2))
+        self.assertFalse(result.succeeded)
+        self.assertEqual(list(result.failures), ['project_tests/broken.eh'])
+        self.assertEqual(result.skipped, ['project_tests/user.eh'])
+        self.assertTrue(path.isfile('out/src/project_tests/alone.c'))
+
+    def test_incremental_build(self):
+        self.write_source('out/incremental/lib.eh', 'int lib()\n{\n\treturn 1\n}\n')
+        self.write_source('out/incremental/user.eh',
+                          'import lib\n\nint user()\n{\n\treturn lib()\n}\n')
+        state = 'out/incremental/build_state.json'
+        if path.exists(state):
+            os.remove(state)
+        opts = self.options(['out/incremental'], 1, state)
+
+        result = build_project(opts)
+        self.assertTrue(result.succeeded)
+        self.assertEqual(result.up_to_date, [])
+        result = build_project(opts)
+        self.assertEqual(result.up_to_date, ['out/incremental/lib.eh', 'out/incremental/user.eh'])
+
+        # Only the body changes, the import file stays the same
+        self.write_source('out/incremental/lib.eh', 'int lib()\n{\n\treturn 2\n}\n')
+        result = build_project(opts)
+        self.assertEqual(result.up_to_date, ['out/incremental/user.eh'])
+        self.assertEqual(result.untouched, 1)
+
+        # The prototype changes, so does the import file
+        self.write_source('out/incremental/lib.eh', 'int lib(int i)\n{\n\treturn i\n}\n')
+        result = build_project(opts)
+        self.assertEqual(result.up_to_date, [])
+        self.assertEqual(list(result.failures), ['out/incremental/user.eh'])
+
+        # The C files are not the same with headers, building with them rebuilds everything
+        self.write_source('out/incremental/user.eh',
+                          'import lib\n\nint user()\n{\n\treturn lib(1)\n}\n')
+        self.assertTrue(build_project(opts).succeeded)
+        opts.headers = True
+        result = build_project(opts)
+        self.assertEqual(result.up_to_date, [])
+        self.assertTrue(path.isfile('out/include/out/incremental/lib.h'))
+        result = build_project(opts)
+        self.assertEqual(result.up_to_date, ['out/incremental/lib.eh', 'out/incremental/user.eh'])
+
+    def test_incremental_build_dependencies(self):
+        self.write_source('out/dependencies/lib.eh', 'int lib()\n{\n\treturn 1\n}\n')
+        self.write_source('out/dependencies/lib.h', '#include "lib_types.h"\n')
+        self.write_source('out/dependencies/lib_types.h', 'typedef int lib_t;\n')
+        self.write_source('out/dependencies/project/user.eh',
+                          'import out.dependencies.lib\ninclude out/dependencies/lib.h\n\n'
+                          'lib_t user()\n{\n\treturn lib()\n}\n')
+        state = 'out/dependencies/build_state.json'
+        if path.exists(state):
+            os.remove(state)
+        opts = self.options(['out/dependencies/project'], 1, state)
+        self.assertTrue(build_project(opts).succeeded)
+        self.assertEqual(build_project(opts).up_to_date, ['out/dependencies/project/user.eh'])
+
+        # Neither the imported file nor the headers are part of the project, they are still
+        # dependencies of the source
+        for dependency in ('lib.eh', 'lib.h', 'lib_types.h'):
+            with self.subTest(dependency=dependency):
+                with open(path.join('out/dependencies', dependency), 'a') as f:
+                    f.write('\n')
+                result = build_project(opts)
+                self.assertTrue(result.succeeded)
+                self.assertEqual(result.up_to_date, [])
+                self.assertEqual(build_project(opts).up_to_date,
+                                 ['out/dependencies/project/user.eh'])
@@ -0,0 +1,71 @@
+# Copyright © 2019 Cedric Legrand
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice (including the next
+# paragraph) shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import socket
+import unittest
+from tempfile import mkdtemp
+from threading import Thread
+
+from test.common import EhlitTestCase
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'the compile server needs Unix sockets')
+class TestServer(EhlitTestCase):
+    """ Test building through the compile server """
+
+    def setUp(self):
+        super().setUp()
+        from ehlit import client
+        from ehlit.server import make_server
+        self.client = client
+        self.socket = os.path.join(mkdtemp(), 'ehlit.sock')
+        self.server = make_server(self.socket)
+        self.thread = Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+        os.unlink(self.socket)
+        os.rmdir(os.path.dirname(self.socket))
+        super().tearDown()
+
+    def test_build(self):
+        reply = self.client.build(['language/function.eh', '-o', '-', '--gen-import-output',
+                                   'out/server/function.eh'], self.socket)
+        self.assertEqual(reply['status'], 0)
+        self.assertEqual(reply['stderr'], '')
+        with open('language/function.eh.c', 'r') as f:
+            self.assertEqual(reply['stdout'], f.read())
+
+    def test_failure(self):
+        reply = self.client.build(['project_tests/broken.eh'], self.socket)
+        self.assertNotEqual(reply['status'], 0)
+        self.assertIn('project_tests/broken.eh', reply['stderr'])
+        reply = self.client.build(['--gen-no-such-option'], self.socket)
+        self.assertEqual(reply['status'], 2)
+        self.assertIn('error: the following arguments are required', reply['stderr'])
+
+    def test_no_server(self):
+        with self.assertRaises(OSError):
+            self.client.build(['language/function.eh'], self.socket + '.none')